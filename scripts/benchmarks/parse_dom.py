@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Benchmark: parse_dom on large DOM snapshots.
+
+Compares the previous parser (list of dicts, sort, then a second dict per
+element) with the current single-pass parser, and checks both produce the
+same prompt and element dict.
+
+Snapshots are the JSON maps returned by getDomSnapshot. Record one from a
+live page with:
+
+    interactable, _ = mark_dom(driver)
+    json.dump(interactable, open("reddit.json", "w"))
+
+Such snapshots carry the displayText computed by build_dom.js and no text
+nodes, so the previous parser reads displayText when an element has it and
+only rebuilds the text from text nodes otherwise. Both parsers then compare
+on the same text, and the measurement covers parsing only.
+
+Without --snapshot, a synthetic feed-style page with text nodes and no
+displayText is generated.
+
+Usage:
+    python scripts/benchmarks/parse_dom.py [--snapshot reddit.json ...] [--nodes 50000] [--number 20]
+"""
+
+import argparse
+import json
+import random
+import timeit
+
+from netgent.browser.utils.parse_dom import parse_dom, _extract_text_content
+
+
+def legacy_parse_dom(dom_data):
+    """The parse_dom implementation before the single-pass rewrite (reading displayText, see above)."""
+    if not dom_data or 'map' not in dom_data:
+        return "No DOM data available.", {}
+
+    elements_map = dom_data['map']
+    highlighted_elements = []
+
+    for _, element_data in elements_map.items():
+        highlight_index = element_data.get('highlightIndex', None)
+        if highlight_index is not None and element_data.get('isVisible', False):
+            text = element_data.get('displayText')
+            if text is None:
+                text = _extract_text_content(element_data, elements_map)
+            tag_name = element_data.get('tagName', 'unknown')
+            metadata = element_data.get('metadata', {})
+            accessible_name = metadata.get('accessibleName', '')
+
+            highlighted_elements.append({
+                'highlight_index': highlight_index,
+                'tag_name': tag_name,
+                'text': text,
+                'accessible_name': accessible_name,
+                'metadata': metadata,
+                'x': element_data.get('x', 0),
+                'y': element_data.get('y', 0),
+                'width': element_data.get('width', 0),
+                'height': element_data.get('height', 0),
+            })
+
+    highlighted_elements.sort(key=lambda x: x['highlight_index'])
+
+    prompt = []
+    elements_dict = {}
+
+    for element in highlighted_elements:
+        text = element['text']
+        aria_label = element['accessible_name']
+        tag_name = element['tag_name']
+        highlight_index = element['highlight_index']
+        metadata = element['metadata']
+
+        if text or aria_label:
+            label = f"{highlight_index} (<{tag_name}/>): " + (f"Text: {text}" if text else "") + (f", Aria Label: {aria_label}" if aria_label else "")
+        else:
+            label = f"{highlight_index} (<{tag_name}/>): <empty/>"
+        prompt.append(label)
+
+        elements_dict[str(highlight_index)] = {
+            'accessible_name': metadata.get('accessibleName', ''),
+            'aria_role': metadata.get('ariaRole', ''),
+            'css_selector': metadata.get('cssSelector', ''),
+            'enhanced_css_selector': metadata.get('enhancedCssSelector', ''),
+            'tag_name': metadata.get('tagName', tag_name),
+            'text': metadata.get('text', text),
+            'xpath': metadata.get('xpath', ''),
+            'x': metadata.get('x', 0),
+            'y': metadata.get('y', 0),
+            'width': metadata.get('width', 0),
+            'height': metadata.get('height', 0),
+        }
+
+    if not prompt:
+        return "No highlighted elements found.", {}
+
+    return "\n".join(prompt), elements_dict
+
+
+def synthetic_snapshot(nodes: int, highlighted: float = 0.05, seed: int = 0) -> dict:
+    """A feed-like map: nested divs with text, a share of them highlighted links."""
+    rng = random.Random(seed)
+    elements_map = {}
+    body_children = []
+    highlight_index = 0
+    node_id = 0
+    while node_id < nodes - 1:
+        text_id, element_id = str(node_id), str(node_id + 1)
+        node_id += 2
+        elements_map[text_id] = {"type": "TEXT_NODE", "text": f" post {element_id} ", "isVisible": True}
+        element = {
+            "tagName": "a" if rng.random() < highlighted else "div",
+            "attributes": {},
+            "xpath": f"/body/div[{element_id}]",
+            "children": [text_id],
+            "isVisible": True,
+        }
+        if element["tagName"] == "a":
+            element.update({
+                "isTopElement": True,
+                "isInteractive": True,
+                "highlightIndex": highlight_index,
+                "metadata": {
+                    "cssSelector": f"a:nth-of-type({highlight_index + 1})",
+                    "enhancedCssSelector": f"body > a:nth-of-type({highlight_index + 1})",
+                    "xpath": element["xpath"],
+                    "tagName": "a",
+                    "x": 0, "y": highlight_index * 20, "width": 200, "height": 20,
+                    "ariaRole": "link",
+                    "text": f"post {element_id}",
+                    "accessibleName": "",
+                },
+            })
+            highlight_index += 1
+        elements_map[element_id] = element
+        body_children.append(element_id)
+    elements_map[str(node_id)] = {"tagName": "body", "attributes": {}, "xpath": "/body", "children": body_children}
+    return {"rootId": str(node_id), "map": elements_map}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--snapshot", action="append", default=[], help="Recorded getDomSnapshot JSON file")
+    parser.add_argument("--nodes", type=int, default=50000, help="Nodes in the synthetic snapshot")
+    parser.add_argument("--number", type=int, default=20, help="Parses per measurement")
+    args = parser.parse_args()
+
+    snapshots = [(path, json.load(open(path))) for path in args.snapshot]
+    if not snapshots:
+        snapshots = [(f"synthetic ({args.nodes} nodes)", synthetic_snapshot(args.nodes))]
+
+    print(f"{'snapshot':<32}{'before (ms)':>14}{'after (ms)':>14}{'speedup':>10}")
+    for name, snapshot in snapshots:
+        if legacy_parse_dom(snapshot) != parse_dom(snapshot):
+            raise SystemExit(f"{name}: parsers disagree")
+        before = min(timeit.repeat(lambda: legacy_parse_dom(snapshot), number=args.number, repeat=3))
+        after = min(timeit.repeat(lambda: parse_dom(snapshot), number=args.number, repeat=3))
+        before_ms = before / args.number * 1e3
+        after_ms = after / args.number * 1e3
+        print(f"{name:<32}{before_ms:>14.3f}{after_ms:>14.3f}{before_ms / after_ms:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
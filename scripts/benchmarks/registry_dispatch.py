@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark: trigger/action dispatch cost through the registries.
+
+Compares the previous per-call inspect.signature() + bind() validation with the
+ParameterValidator compiled when the registry binds its methods. The controller
+used here does no browser work, so the numbers are pure dispatch overhead.
+
+Usage:
+    python scripts/benchmarks/registry_dispatch.py [--number 200000]
+"""
+
+import argparse
+import inspect
+import timeit
+
+from netgent.browser.registry import ActionTriggerMeta, ActionRegistry, TriggerRegistry, action, trigger
+
+
+class BenchController(metaclass=ActionTriggerMeta):
+    @trigger(name="element")
+    def check_element(self, by: str, selector: str, check_visibility: bool = True, timeout: float = 0.1) -> bool:
+        return True
+
+    @trigger(name="url")
+    def check_url(self, url: str) -> bool:
+        return True
+
+    @action()
+    def click(self, by: str = None, selector: str = None, x: float = None, y: float = None, percentage: float = 0.5):
+        return None
+
+
+def legacy_dispatch(method, params):
+    """The validation previously done on every ActionRegistry/TriggerRegistry call."""
+    sig = inspect.signature(method)
+    kwargs = {k: v for k, v in params.items() if k != 'self'}
+    bound = sig.bind(**kwargs)
+    bound.apply_defaults()
+    return method(**bound.arguments)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--number", type=int, default=200000, help="Dispatches per measurement")
+    args = parser.parse_args()
+
+    controller = BenchController()
+    triggers = TriggerRegistry(controller)
+    actions = ActionRegistry(controller)
+
+    cases = [
+        ("trigger element", triggers.get_trigger("element"), {"by": "css selector", "selector": "#main"},
+         lambda p: triggers.check("element", p)),
+        ("trigger url", triggers.get_trigger("url"), {"url": "https://example.com"},
+         lambda p: triggers.check("url", p)),
+        ("action click", actions.get_action("click"), {"x": 10, "y": 20},
+         lambda p: actions.execute("click", p)),
+    ]
+
+    print(f"{'case':<18}{'before (us)':>14}{'after (us)':>14}{'speedup':>10}")
+    for name, method, params, dispatch in cases:
+        before = min(timeit.repeat(lambda: legacy_dispatch(method, params), number=args.number, repeat=3))
+        after = min(timeit.repeat(lambda: dispatch(params), number=args.number, repeat=3))
+        before_us = before / args.number * 1e6
+        after_us = after / args.number * 1e6
+        print(f"{name:<18}{before_us:>14.3f}{after_us:>14.3f}{before_us / after_us:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
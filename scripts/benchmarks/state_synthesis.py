@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Benchmark: StateSynthesis.run with and without speculative synthesis.
+
+Uses an LLM that answers after a fixed latency and a driver that serves a
+recorded page, so the numbers show how much of the LLM latency overlaps.
+The page only matches the expected state by its host, so the local guess is
+speculated on while the LLM confirms it.
+Each mode runs StateSynthesis.run several times in a row on the same
+instance and checks that every run selects the expected state and returns
+its triggers and prompt, so the concurrent calls stay reusable across runs.
+
+Usage:
+    python scripts/benchmarks/state_synthesis.py [--latency 0.2] [--runs 3]
+"""
+
+import argparse
+import time
+from types import SimpleNamespace
+
+from langchain_core.messages import AIMessage
+
+from netgent.components.state_synthesis import StateSynthesis
+from netgent.components.state_synthesis.prompt import get_prompt
+from netgent.utils.message import StatePrompt
+
+PAGE_TRIGGERS = [
+    {"tagName": "a", "text": "Sign in", "enhancedCssSelector": "a#sign-in", "accessibleName": "Sign in",
+     "viewport": {"top": 10, "bottom": 30}},
+    {"tagName": "input", "text": "", "enhancedCssSelector": "input[name=\"q\"]", "accessibleName": "Search",
+     "viewport": {"top": 40, "bottom": 60}},
+]
+
+PROMPTS = [
+    StatePrompt(name="Home", description="Search from the home page",
+                triggers=["The URL is example.com", "The search box is visible"], actions=["Search for cats"]),
+    StatePrompt(name="Results", description="Open the first result",
+                triggers=["A list of results is visible"], actions=["Click the first result"]),
+]
+
+
+class BenchDriver:
+    current_url = "https://example.com/"
+    title = "Example"
+
+    def execute_cdp_cmd(self, cmd, params):
+        if cmd == "Runtime.evaluate":
+            return {"result": {"value": PAGE_TRIGGERS}}
+        return {}
+
+
+class BenchLLM:
+    """Answers every call after `latency` seconds, from any thread."""
+
+    def __init__(self, latency: float, choice: str):
+        self.latency = latency
+        self.choice = choice
+
+    def invoke(self, messages, *args, **kwargs):
+        time.sleep(self.latency)
+        if messages[0].content.startswith(get_prompt("CHOOSE_STATE_PROMPT")[:40]):
+            return AIMessage(content=f"State: {self.choice}")
+        return AIMessage(content="Type 'cats' into the search box, then TERMINATE")
+
+    def with_structured_output(self, schema):
+        llm = self
+
+        class Structured:
+            def invoke(self, messages, *args, **kwargs):
+                time.sleep(llm.latency)
+                return schema(triggers=["URL", "CSS_1"])
+
+        return Structured()
+
+
+def measure(speculative: bool, latency: float, runs: int) -> float:
+    controller = SimpleNamespace(driver=BenchDriver(), get_viewport_geometry=lambda: {"innerHeight": 800})
+    synthesis = StateSynthesis(BenchLLM(latency, "Home"), controller, {"speculative_synthesis": speculative})
+    start = time.perf_counter()
+    for run in range(runs):
+        state = synthesis.run(PROMPTS, [])
+        choice = state.get("choice")
+        if choice is None or choice.name != "Home" or not state.get("triggers") or not state.get("prompt"):
+            raise SystemExit(f"run {run + 1} (speculative={speculative}) returned {state}")
+    return (time.perf_counter() - start) / runs * 1e3
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--latency", type=float, default=0.2, help="Seconds per LLM call")
+    parser.add_argument("--runs", type=int, default=3, help="Consecutive runs per mode")
+    args = parser.parse_args()
+
+    sequential = measure(False, args.latency, args.runs)
+    speculative = measure(True, args.latency, args.runs)
+    print(f"{'mode':<24}{'per run (ms)':>14}")
+    print(f"{'sequential':<24}{sequential:>14.1f}")
+    print(f"{'speculative':<24}{speculative:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Benchmark: cursor tween generation cost at high action rates.
+
+Compares the per-movement cost of the previous tween (a fresh lambda around
+bezier() evaluated on every step) with the shared precomputed easing table,
+and measures batch generation of jittered paths. pyautogui calls the tween
+once per step, so each measurement evaluates a full movement of --steps steps.
+
+Usage:
+    python scripts/benchmarks/tween_generation.py [--movements 2000] [--steps 100]
+"""
+
+import argparse
+import random
+import time
+
+from netgent.browser.controller.easing import bezier, get_easing
+
+
+def measure(movement, movements: int) -> float:
+    start = time.perf_counter()
+    for _ in range(movements):
+        movement()
+    return (time.perf_counter() - start) / movements * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--movements", type=int, default=2000, help="Movements per measurement")
+    parser.add_argument("--steps", type=int, default=100, help="Tween evaluations per movement")
+    args = parser.parse_args()
+
+    points = [i / args.steps for i in range(args.steps + 1)]
+
+    def legacy_movement():
+        bezier_fn = lambda n: bezier(n, (0.25, 0.1), (0.75, 0.9))
+        for n in points:
+            bezier_fn(n)
+
+    def table_movement():
+        tween = get_easing((0.25, 0.1), (0.75, 0.9))
+        for n in points:
+            tween(n)
+
+    rng = random.Random(0)
+
+    def jittered_movement():
+        tween = get_easing((0.25, 0.1), (0.75, 0.9)).jittered(0.05, rng=rng)
+        for n in points:
+            tween(n)
+
+    easing = get_easing((0.25, 0.1), (0.75, 0.9))
+    error = max(abs(easing(n) - bezier(n)) for n in (i / 100000 for i in range(100001)))
+
+    legacy = measure(legacy_movement, args.movements)
+    table = measure(table_movement, args.movements)
+    jittered = measure(jittered_movement, args.movements)
+    print(f"{'tween':<24}{'us/movement':>14}")
+    print(f"{'bezier() per step':<24}{legacy:>14.2f}")
+    print(f"{'precomputed table':<24}{table:>14.2f}  ({legacy / table:.1f}x, max error {error:.2e})")
+    print(f"{'jittered table':<24}{jittered:>14.2f}  (includes generating the path)")
+
+
+if __name__ == "__main__":
+    main()
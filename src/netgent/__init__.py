@@ -44,7 +44,7 @@ Reference:
     Research Paper: https://arxiv.org/abs/2406.08392
     "NetGent: Agent-Based Automation of Network Application Workflows"
 """
-from .utils import StatePrompt, Message, Element, Toolcall, ActionOutput, Decision, Reflection, Metadata, ExecutedState, format_context, format_context_without_reflection, save_context_to_file, load_context_from_file
+from .utils import StatePrompt, Message, Element, Toolcall, ActionOutput, Decision, Reflection, Metadata, ExecutedState, format_context, format_context_without_reflection, ContextBuilder, spill_screenshots, BlobStore, save_context_to_file, load_context_from_file
 from .agent import NetGent, NetGentState
 from .browser import BrowserSession, PyAutoGUIController, BaseController
 from .components import (
@@ -81,6 +81,9 @@ __all__ = [
     "ExecutedState",
     "format_context",
     "format_context_without_reflection",
+    "ContextBuilder",
+    "spill_screenshots",
+    "BlobStore",
     "save_context_to_file",
     "load_context_from_file",
 ]
@@ -11,6 +11,7 @@ from netgent.components.state_synthesis import StateSynthesis
 import time
 from netgent.components.web_agent import WebAgent
 from netgent.utils.message import StatePrompt
+from netgent.utils.llm_cache import DiskLLMCache
 load_dotenv()
 
 class NetGentState(TypedDict):
@@ -33,10 +34,6 @@ class NetGent():
         self.driver = driver
         if self.driver is None:
             self.driver = BrowserSession(user_data_dir=user_data_dir).driver
-        self.controller = controller
-        if self.controller is None:
-            self.controller = PyAutoGUIController(self.driver)
-
         
         default_config = {
             "action_period": 1,
@@ -44,13 +41,57 @@ class NetGent():
             "recursion_limit": 100,
             "allow_multiple_states": False,
             "state_timeout": 30,
+            "batch_triggers": False,
+            "wait_mode": "sleep",
+            "settle_period": 0.3,
+            "motion_profile": "human",
+            "incremental_snapshots": False,
+            "screenshot_format": "png",
+            "screenshot_quality": None,
+            "screenshot_clip": None,
+            "screenshot_token_budget": None,
+            "screenshot_reuse_threshold": None,
+            "reload_prompts": False,
+            "context_window": None,
+            "screenshots_in_memory": 3,
+            "blob_store_dir": None,
+            "llm_cache_dir": None,
+            "llm_cache_ttl": None,
+            "llm_cache_max_entries": 10000,
+            "llm_cache_perceptual": False,
+            "speculative_synthesis": True,
+            "local_state_selection": True,
+            "max_trigger_candidates": 60,
+            "trigger_candidate_token_budget": 2000,
+            "validate_triggers": True,
+            "slow_trigger_ms": 50.0,
+            "element_token_budget": None,
         }
         self.config = {**default_config, **(config or {})}
+
+        self.llm_cache = None
+        if self.llm is not None and self.config["llm_cache_dir"]:
+            self.llm_cache = DiskLLMCache(
+                self.config["llm_cache_dir"],
+                ttl=self.config["llm_cache_ttl"],
+                max_entries=self.config["llm_cache_max_entries"],
+            )
+            self.llm.cache = self.llm_cache
+
+        self.controller = controller
+        if self.controller is None:
+            self.controller = PyAutoGUIController(self.driver, motion_profile=self.config["motion_profile"])
         
         self.program_controller = ProgramController(self.controller, self.config)
         self.state_executor = StateExecutor(self.controller, self.config)
-        self.web_agent = WebAgent(self.llm, self.controller)
-        self.state_synthesis = StateSynthesis(self.llm, self.controller)
+        self.web_agent = WebAgent(self.llm, self.controller, {
+            **self.config,
+            "screenshot_perceptual_hash": self.llm_cache is not None and self.config["llm_cache_perceptual"],
+        })
+        if self.llm_cache is not None and self.config["llm_cache_perceptual"]:
+            # Key screenshots by perceptual hash so near-identical frames hit the cache
+            self.llm_cache.image_key = self.web_agent.screenshots.image_key
+        self.state_synthesis = StateSynthesis(self.llm, self.controller, self.config)
         self.workflow = StateGraph(NetGentState)
         self.graph = self.compile()
     
@@ -141,10 +182,13 @@ class NetGent():
         return "program_controller"
 
     def _program_controller(self, state: NetGentState):
-        # Wait transition period between checks
-        time.sleep(self.config["transition_period"])
-        
-        passed_states = self.program_controller.check(state.get('state_repository'))
+        if self.config["wait_mode"] == "event":
+            # Check as soon as the page changes, waiting at most the transition period
+            passed_states = self.program_controller.wait_and_check(state.get('state_repository'))
+        else:
+            # Wait transition period between checks
+            time.sleep(self.config["transition_period"])
+            passed_states = self.program_controller.check(state.get('state_repository'))
         
         # Update recursion count
         recursion_count = state.get('recursion_count', 0) + 1
@@ -190,7 +234,11 @@ class NetGent():
             state.get('executed_states', [])
         )
         print(state_synthesis_state)
-        return {**state,"synthesis_prompt": state_synthesis_state.get('prompt'), "synthesis_choice": state_synthesis_state.get('choice'), "synthesis_triggers": state_synthesis_state.get('triggers')}
+        triggers = state_synthesis_state.get('triggers')
+        # Validate while the page the triggers were defined on is still loaded
+        if self.config["validate_triggers"] and triggers:
+            triggers, _ = self.program_controller.validate_checks(triggers)
+        return {**state,"synthesis_prompt": state_synthesis_state.get('prompt'), "synthesis_choice": state_synthesis_state.get('choice'), "synthesis_triggers": triggers}
     
     def _web_agent(self, state: NetGentState):
         synthesis_state = {"prompt": state.get('synthesis_prompt', '')}
@@ -231,6 +279,10 @@ class NetGent():
         
         # Add new state to state repository
         updated_state_repository = state_repository + [new_state]
+        conflicts = self.program_controller.conflicting_states(new_state)
+        if conflicts:
+            print(f"Warning: checks of {new_state['name']} overlap with states {conflicts}")
+        self.program_controller.add_state(new_state)
         
         # Track executed states for state synthesis
         executed_states = state.get('executed_states', [])
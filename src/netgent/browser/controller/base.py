@@ -3,18 +3,40 @@ from seleniumbase import Driver
 import time
 from ..registry import action, trigger, ActionTriggerMeta
 from ..stats_logger import VideoStatsLogger
+from ..utils.check_triggers import check_triggers, element_spec, text_spec
+from ..utils.locate import resolve_element
+from ..utils.page_scripts import install_page_scripts
 
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
 
 from selenium.webdriver.support.ui import WebDriverWait
 
+# Everything get_element_coordinates needs from the page, in one evaluation
+# (also returned by window.resolveElement in utils/locate.js)
+VIEWPORT_GEOMETRY_SCRIPT = """({
+    scrollX: window.pageXOffset || document.documentElement.scrollLeft,
+    scrollY: window.pageYOffset || document.documentElement.scrollTop,
+    panelWidth: window.outerWidth - window.innerWidth,
+    panelHeight: window.outerHeight - window.innerHeight,
+    innerWidth: window.innerWidth,
+    innerHeight: window.innerHeight,
+    screenX: window.screenX,
+    screenY: window.screenY,
+    outerWidth: window.outerWidth,
+    outerHeight: window.outerHeight
+})"""
+
 class BaseController(ABC, metaclass=ActionTriggerMeta):
     """Base controller with automatic action and trigger registration via combined metaclass."""
     
     def __init__(self, driver: Driver):
         self.driver = driver
         self.stats_logger = VideoStatsLogger(driver)
+        # (window geometry, window position) from the last get_window_position call
+        self._window_position_cache = None
+        # Register the in-page helpers before the first navigation
+        install_page_scripts(driver)
 
     @action()
     def navigate(self, url: str):
@@ -155,10 +177,23 @@ class BaseController(ABC, metaclass=ActionTriggerMeta):
     return isVisible && isInViewport;
 """, element)
 
+    def probe(self, spec: dict) -> bool:
+        """Answer a trigger spec without waiting, in a single script call."""
+        try:
+            return check_triggers(self.driver, [spec])[0]
+        except Exception:
+            return False
+
     # -- Trigger Methods --
     @trigger(name="element")
-    def check_element(self, by: str, selector: str, check_visibility: bool = True, timeout: float = 0.1) -> bool:
-        """Check if an element exists and optionally if it's visible."""
+    def check_element(self, by: str, selector: str, check_visibility: bool = True, timeout: float = 0) -> bool:
+        """Check if an element exists and optionally if it's visible.
+
+        With the default timeout of 0 the page is probed once and a miss returns
+        immediately; a positive timeout waits for the element to appear.
+        """
+        if not timeout:
+            return self.probe(element_spec(by, selector, check_visibility))
         try:
             element = WebDriverWait(self.driver, timeout).until(
                 EC.presence_of_element_located((by, selector))
@@ -178,8 +213,14 @@ class BaseController(ABC, metaclass=ActionTriggerMeta):
             return False
 
     @trigger(name="text")
-    def check_text(self, text: str, check_visibility: bool = True, timeout: float = 0.1) -> bool:
-        """Check if text exists on the page and optionally if it's visible."""
+    def check_text(self, text: str, check_visibility: bool = True, timeout: float = 0) -> bool:
+        """Check if text exists on the page and optionally if it's visible.
+
+        With the default timeout of 0 the page is probed once and a miss returns
+        immediately; a positive timeout waits for the text to appear.
+        """
+        if not timeout:
+            return self.probe(text_spec(text, check_visibility))
         try:
             element = WebDriverWait(self.driver, timeout).until(
                 EC.presence_of_element_located((By.XPATH, f"//*[normalize-space(text())='{text}']"))
@@ -191,13 +232,31 @@ class BaseController(ABC, metaclass=ActionTriggerMeta):
             return False
 
     
-    def get_element_coordinates(self, x, y, width, height, percentage=0.5):
+    def get_viewport_geometry(self) -> dict:
+        """Scroll offsets, browser panel sizes and window geometry in a single CDP call."""
+        return self.driver.execute_cdp_cmd("Runtime.evaluate", {"expression": VIEWPORT_GEOMETRY_SCRIPT, "returnByValue": True})["result"]["value"]
+
+    def get_window_position(self, geometry: dict) -> tuple[float, float]:
+        """
+        Get the browser window position, reusing the last WebDriver answer.
+
+        The position is only re-read when the window has moved or been resized,
+        as reported by the screen and outer window fields of the geometry.
+        """
+        key = (geometry["screenX"], geometry["screenY"], geometry["outerWidth"], geometry["outerHeight"])
+        if self._window_position_cache is None or self._window_position_cache[0] != key:
+            window_pos = self.driver.get_window_position()
+            self._window_position_cache = (key, (window_pos['x'], window_pos['y']))
+        return self._window_position_cache[1]
+
+    def get_element_coordinates(self, x, y, width, height, percentage=0.5, geometry: dict = None):
         """
         Get the absolute screen coordinates for an element.
         
         Args:
-            element: Selenium WebElement
+            x, y, width, height: Element rect relative to the document
             percentage: Horizontal offset percentage within the element (0.0 to 1.0)
+            geometry: Viewport geometry already read from the page (optional)
             
         Returns:
             tuple: (abs_x, abs_y) absolute screen coordinates
@@ -206,17 +265,13 @@ class BaseController(ABC, metaclass=ActionTriggerMeta):
         element_x = x
         element_y = y
 
-        # Get current scroll position
-        scroll_x = self.driver.execute_cdp_cmd("Runtime.evaluate", {"expression": "window.pageXOffset || document.documentElement.scrollLeft", "returnByValue": True})["result"]["value"]
-        scroll_y = self.driver.execute_cdp_cmd("Runtime.evaluate", {"expression": "window.pageYOffset || document.documentElement.scrollTop", "returnByValue": True})["result"]["value"]
-
-        # Get browser window position and panel dimensions
-        panel_height = self.driver.execute_cdp_cmd("Runtime.evaluate", {"expression": "window.outerHeight - window.innerHeight", "returnByValue": True})["result"]["value"]
-        panel_width = self.driver.execute_cdp_cmd("Runtime.evaluate", {"expression": "window.outerWidth - window.innerWidth", "returnByValue": True})["result"]["value"]
-        
-        window_pos = self.driver.get_window_position()
-        window_x = window_pos['x']
-        window_y = window_pos['y']
+        if geometry is None:
+            geometry = self.get_viewport_geometry()
+        scroll_x = geometry["scrollX"]
+        scroll_y = geometry["scrollY"]
+        panel_height = geometry["panelHeight"]
+        panel_width = geometry["panelWidth"]
+        window_x, window_y = self.get_window_position(geometry)
 
         # Calculate coordinates relative to the viewport (subtract scroll position)
         viewport_x = element_x - scroll_x
@@ -230,4 +285,27 @@ class BaseController(ABC, metaclass=ActionTriggerMeta):
         abs_y += height * 0.5
         
         return abs_x, abs_y
-    
+
+    def locate_element(self, by: str, selector: str, percentage: float = 0.5, timeout: float = 10):
+        """
+        Resolve an element to absolute screen coordinates with a single script call.
+
+        Args:
+            by: Locator strategy
+            selector: Selector string
+            percentage: Horizontal offset percentage within the element (0.0 to 1.0)
+            timeout: Seconds to wait for the element to be present
+
+        Returns:
+            tuple: (abs_x, abs_y) absolute screen coordinates
+
+        Raises:
+            ValueError: If the element is not found within the timeout
+        """
+        element = resolve_element(self.driver, by, selector, timeout=timeout)
+        if element is None:
+            raise ValueError(f"Element not found within {timeout} seconds")
+        rect = element["document"]
+        return self.get_element_coordinates(
+            rect["x"], rect["y"], rect["width"], rect["height"], percentage, geometry=element["geometry"]
+        )
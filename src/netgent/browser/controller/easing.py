@@ -0,0 +1,88 @@
+"""
+Easing curves for pyautogui cursor movement.
+
+pyautogui calls its tween function once per movement step. Instead of
+evaluating the bezier polynomial on every step (and building a new closure
+for every click), the curve is sampled once per control-point pair into a
+lookup table that every movement reuses.
+"""
+
+import random
+from functools import lru_cache
+
+# Samples per curve; linear interpolation between samples keeps the error far
+# below a pixel for any on-screen movement
+DEFAULT_RESOLUTION = 1024
+# Samples between two jitter knots of a per-movement jittered curve
+JITTER_SAMPLES_PER_KNOT = 16
+
+
+def bezier(n, control_point_1=(0.25, 0.1), control_point_2=(0.75, 0.9)):
+    """Bezier curve tween function for smooth mouse movement."""
+    if not 0.0 <= n <= 1.0:
+        raise ValueError("Argument must be between 0.0 and 1.0.")
+
+    t = n
+    u = 1 - t
+    y = (u ** 3 * 0 +
+        3 * u ** 2 * t * control_point_1[1] +
+        3 * u * t ** 2 * control_point_2[1] +
+        t ** 3 * 1)
+    return max(0.0, min(1.0, y))
+
+
+class BezierEasing:
+    """A tween function backed by a precomputed table of a bezier easing curve."""
+
+    __slots__ = ("resolution", "table")
+
+    def __init__(self, table: list[float]):
+        self.resolution = len(table) - 1
+        self.table = table
+
+    @classmethod
+    def from_control_points(cls, control_point_1=(0.25, 0.1), control_point_2=(0.75, 0.9), resolution: int = DEFAULT_RESOLUTION) -> "BezierEasing":
+        return cls([bezier(i / resolution, control_point_1, control_point_2) for i in range(resolution + 1)])
+
+    def __call__(self, n: float) -> float:
+        if not 0.0 <= n <= 1.0:
+            raise ValueError("Argument must be between 0.0 and 1.0.")
+        position = n * self.resolution
+        index = int(position)
+        if index >= self.resolution:
+            return self.table[-1]
+        low = self.table[index]
+        return low + (self.table[index + 1] - low) * (position - index)
+
+    def jittered(self, amplitude: float, knots: int = 8, rng: random.Random = None) -> "BezierEasing":
+        """
+        A human-like variant of this curve, generated for the whole path at once.
+
+        Random offsets of up to `amplitude` are drawn for a few evenly spaced knots
+        and interpolated between them, so the cursor drifts smoothly rather than
+        shaking. The endpoints stay pinned and the curve never moves backwards.
+        The variant uses a coarser table since it is rebuilt for every movement.
+        """
+        rng = rng or random
+        offsets = [0.0] + [rng.uniform(-amplitude, amplitude) for _ in range(knots - 1)] + [0.0]
+        samples_per_knot = JITTER_SAMPLES_PER_KNOT
+        resolution = knots * samples_per_knot
+        step = self.resolution / resolution
+
+        table = [0.0] * (resolution + 1)
+        previous = 0.0
+        for knot in range(knots):
+            low, high = offsets[knot], offsets[knot + 1]
+            for sample in range(samples_per_knot):
+                i = knot * samples_per_knot + sample
+                value = self.table[int(i * step)] + low + (high - low) * (sample / samples_per_knot)
+                previous = max(previous, min(1.0, max(0.0, value)))
+                table[i] = previous
+        table[-1] = self.table[-1]
+        return BezierEasing(table)
+
+
+@lru_cache(maxsize=None)
+def get_easing(control_point_1=(0.25, 0.1), control_point_2=(0.75, 0.9)) -> BezierEasing:
+    """The shared easing table for a control-point pair, built on first use."""
+    return BezierEasing.from_control_points(control_point_1, control_point_2)
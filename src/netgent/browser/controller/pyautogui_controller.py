@@ -1,8 +1,8 @@
 from math import pi
 from .base import BaseController
 from seleniumbase import Driver
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
+from ..utils.locate import resolve_element
+from .easing import bezier, get_easing
 import pyautogui
 import time
 import random
@@ -10,24 +10,68 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# bezier lived in this module before easing.py and is still importable from here
+__all__ = ["PyAutoGUIController", "MOTION_PROFILES", "bezier"]
 
-def bezier(n, control_point_1=(0.25, 0.1), control_point_2=(0.75, 0.9)):
-    """Bezier curve tween function for smooth mouse movement."""
-    if not 0.0 <= n <= 1.0:
-        raise ValueError("Argument must be between 0.0 and 1.0.")
-    
-    t = n
-    u = 1 - t
-    y = (u ** 3 * 0 +
-        3 * u ** 2 * t * control_point_1[1] +
-        3 * u * t ** 2 * control_point_2[1] +
-        t ** 3 * 1)
-    return max(0.0, min(1.0, y))
+
+# Timing of simulated input. "human" reproduces realistic pacing; "fast" keeps short
+# visible tweens and types in chunks; "instant" teleports the cursor and types each
+# string in one call. "path_jitter" randomly varies the cursor's pace along each
+# movement by up to that fraction of the distance. pyautogui only tweens for durations
+# above MINIMUM_DURATION (0.1 s), and "pause" controls its PAUSE sleep after every call.
+MOTION_PROFILES = {
+    "human": {
+        "move_duration": 0.5,
+        "scroll_move_duration": 0.2,
+        "type_interval": 0.02,
+        "type_jitter": 0.03,
+        "type_chunk": 1,
+        "clear_delay": 0.1,
+        "path_jitter": 0.03,
+        "pause": True,
+    },
+    "fast": {
+        "move_duration": 0.15,
+        "scroll_move_duration": 0.15,
+        "type_interval": 0.005,
+        "type_jitter": 0.0,
+        "type_chunk": 16,
+        "clear_delay": 0.02,
+        "path_jitter": 0.0,
+        "pause": False,
+    },
+    "instant": {
+        "move_duration": 0.0,
+        "scroll_move_duration": 0.0,
+        "type_interval": 0.0,
+        "type_jitter": 0.0,
+        "type_chunk": None,
+        "clear_delay": 0.0,
+        "path_jitter": 0.0,
+        "pause": False,
+    },
+}
 
 
 class PyAutoGUIController(BaseController):
-    def __init__(self, driver: Driver):
+    def __init__(self, driver: Driver, motion_profile: str = "human"):
         super().__init__(driver)
+        self.set_motion_profile(motion_profile)
+
+    def set_motion_profile(self, motion_profile: str):
+        """Select the input timing profile ("human", "fast" or "instant")."""
+        if motion_profile not in MOTION_PROFILES:
+            available = ", ".join(MOTION_PROFILES)
+            raise ValueError(f"Unknown motion profile '{motion_profile}'. Available: {available}")
+        self.motion_profile = motion_profile
+        self.motion = MOTION_PROFILES[motion_profile]
+
+    def _tween(self):
+        """Easing for the next cursor movement, from the shared precomputed table."""
+        easing = get_easing((0.25, 0.1), (0.75, 0.9))
+        if self.motion["path_jitter"]:
+            return easing.jittered(self.motion["path_jitter"])
+        return easing
 
     def click(self, by: str = None, selector: str = None, x: float = None, y: float = None, percentage: float = 0.5):
         """Click on a specified element or coordinates"""
@@ -36,16 +80,7 @@ class PyAutoGUIController(BaseController):
         # Try using by/selector first if provided
         if by is not None and selector is not None:
             try:
-                element = WebDriverWait(self.driver, 10).until(
-                    EC.presence_of_element_located((by, selector))
-                )
-                click_x, click_y = self.get_element_coordinates(
-                    element.location['x'], 
-                    element.location['y'], 
-                    element.size['width'], 
-                    element.size['height'],
-                    percentage
-                )
+                click_x, click_y = self.locate_element(by, selector, percentage)
             except Exception as e:
                 logger.warning(f"Could not find element with by={by}, selector={selector}: {e}")
                 # Fall through to use x,y coordinates if available
@@ -58,23 +93,25 @@ class PyAutoGUIController(BaseController):
         if click_x is None or click_y is None:
             raise ValueError("Must provide either (by, selector) or (x, y) coordinates")
         
-        bezier_fn = lambda n: bezier(n, (0.25, 0.1), (0.75, 0.9))
-        pyautogui.click(click_x, click_y, duration=0.5, tween=bezier_fn)
+        pyautogui.click(click_x, click_y, duration=self.motion["move_duration"], tween=self._tween(), _pause=self.motion["pause"])
 
     def type_text(self, text: str, by: str = None, selector: str = None, x: float = None, y: float = None):
         """Type text into a specified element or at coordinates"""
         # Click on the element or coordinates first
         self.click(by=by, selector=selector, x=x, y=y)
         ## Delete the Existing Text
-        pyautogui.hotkey('ctrl', 'a')
-        pyautogui.press('delete')
-        time.sleep(0.1)
-        interval = max(0.02, 0.02 + random.uniform(-0.03, 0.03))
+        pause = self.motion["pause"]
+        pyautogui.hotkey('ctrl', 'a', _pause=pause)
+        pyautogui.press('delete', _pause=pause)
+        time.sleep(self.motion["clear_delay"])
+        base_interval = self.motion["type_interval"]
+        interval = max(base_interval, base_interval + random.uniform(-self.motion["type_jitter"], self.motion["type_jitter"]))
         ## Type the New Text
-        for char in text:
-            pyautogui.keyUp('fn')
-            pyautogui.typewrite(char, interval=interval)
-            pyautogui.keyUp('fn')
+        chunk_size = self.motion["type_chunk"] or max(len(text), 1)
+        for start in range(0, len(text), chunk_size):
+            pyautogui.keyUp('fn', _pause=pause)
+            pyautogui.typewrite(text[start:start + chunk_size], interval=interval, _pause=pause)
+            pyautogui.keyUp('fn', _pause=pause)
 
     def move(self, by: str = None, selector: str = None, x: float = None, y: float = None, percentage: float = 0.5):
         """Move to a specified element or coordinates"""
@@ -83,16 +120,7 @@ class PyAutoGUIController(BaseController):
         # Try using by/selector first if provided
         if by is not None and selector is not None:
             try:
-                element = WebDriverWait(self.driver, 10).until(
-                    EC.presence_of_element_located((by, selector))
-                )
-                move_x, move_y = self.get_element_coordinates(
-                    element.location['x'], 
-                    element.location['y'], 
-                    element.size['width'], 
-                    element.size['height'],
-                    percentage
-                )
+                move_x, move_y = self.locate_element(by, selector, percentage)
             except Exception as e:
                 logger.warning(f"Could not find element with by={by}, selector={selector}: {e}")
                 # Fall through to use x,y coordinates if available
@@ -105,34 +133,29 @@ class PyAutoGUIController(BaseController):
         if move_x is None or move_y is None:
             raise ValueError("Must provide either (by, selector) or (x, y) coordinates")
         
-        bezier_fn = lambda n: bezier(n, (0.25, 0.1), (0.75, 0.9))
-        pyautogui.moveTo(move_x, move_y, duration=0.5, tween=bezier_fn)
+        pyautogui.moveTo(move_x, move_y, duration=self.motion["move_duration"], tween=self._tween(), _pause=self.motion["pause"])
     
     def scroll_to(self, by: str = None, selector: str = None, x: float = None, y: float = None):
         """Scroll to a specified element or coordinates"""
         # If by/selector provided, use element-based scrolling
         if by is not None and selector is not None:
             try:
-                if not self.check_element(by, selector, check_visibility=False):
+                element = resolve_element(self.driver, by, selector, timeout=0)
+                if element is None:
                     logger.warning(f"Element with by={by}, selector={selector} not found, trying coordinates")
                 else:
-                    element = WebDriverWait(self.driver, 10).until(
-                        EC.presence_of_element_located((by, selector))
-                    )
-
-                    while not self.check_element(by, selector, check_visibility=True):
-                        element = WebDriverWait(self.driver, 10).until(
-                            EC.presence_of_element_located((by, selector))
-                        )
-                        viewport_height = self.driver.execute_cdp_cmd("Runtime.evaluate", {"expression": "window.innerHeight", "returnByValue": True})["result"]["value"]
-                        scroll_y = self.driver.execute_cdp_cmd("Runtime.evaluate", {"expression": "window.pageYOffset || document.documentElement.scrollTop", "returnByValue": True})["result"]["value"]
-                        elem_y = element.location['y']
-                        if elem_y < scroll_y:
+                    while not element["visible"]:
+                        rect = element["document"]
+                        geometry = element["geometry"]
+                        if rect["y"] < geometry["scrollY"]:
                             self.scroll(direction="up", pixels=5)
-                        elif elem_y > scroll_y + viewport_height - element.size['height']:
+                        elif rect["y"] > geometry["scrollY"] + geometry["innerHeight"] - rect["height"]:
                             self.scroll(direction="down", pixels=5)
                         else:
                             break
+                        element = resolve_element(self.driver, by, selector, timeout=10)
+                        if element is None:
+                            raise ValueError(f"Element with by={by}, selector={selector} disappeared while scrolling")
                     return
             except Exception as e:
                 logger.warning(f"Could not scroll to element: {e}, trying coordinates")
@@ -140,7 +163,7 @@ class PyAutoGUIController(BaseController):
         # If coordinates provided, use coordinate-based scrolling
         if x is not None and y is not None:
             # Move mouse to coordinates and scroll until visible
-            pyautogui.moveTo(x, y, duration=0.2)
+            pyautogui.moveTo(x, y, duration=self.motion["scroll_move_duration"], _pause=self.motion["pause"])
         else:
             raise ValueError("Must provide either (by, selector) or (x, y) coordinates")
 
@@ -158,33 +181,25 @@ class PyAutoGUIController(BaseController):
         # If by and selector are provided, move to that element first
         if by is not None and selector is not None:
             try:
-                element = WebDriverWait(self.driver, 10).until(
-                    EC.presence_of_element_located((by, selector))
-                )
-                scroll_x, scroll_y = self.get_element_coordinates(
-                    element.location['x'], 
-                    element.location['y'], 
-                    element.size['width'], 
-                    element.size['height']
-                )
+                scroll_x, scroll_y = self.locate_element(by, selector)
                 # Move mouse to element before scrolling
-                pyautogui.moveTo(scroll_x, scroll_y, duration=0.2)
+                pyautogui.moveTo(scroll_x, scroll_y, duration=self.motion["scroll_move_duration"], _pause=self.motion["pause"])
             except Exception as e:
                 logger.warning(f"Could not move to element before scrolling: {e}")
                 # Try using x,y coordinates if provided
                 if x is not None and y is not None:
-                    pyautogui.moveTo(x, y, duration=0.2)
+                    pyautogui.moveTo(x, y, duration=self.motion["scroll_move_duration"], _pause=self.motion["pause"])
         # If coordinates are provided but not by/selector, use coordinates
         elif x is not None and y is not None:
-            pyautogui.moveTo(x, y, duration=0.2)
+            pyautogui.moveTo(x, y, duration=self.motion["scroll_move_duration"], _pause=self.motion["pause"])
         
         if direction == "up":
-            pyautogui.scroll(pixels)
+            pyautogui.scroll(pixels, _pause=self.motion["pause"])
         elif direction == "down":
-            pyautogui.scroll(-pixels)
+            pyautogui.scroll(-pixels, _pause=self.motion["pause"])
         else:
             raise ValueError(f"Invalid direction: {direction}")
 
     def press_key(self, key: str):
-        pyautogui.press(key)
+        pyautogui.press(key, _pause=self.motion["pause"])
 
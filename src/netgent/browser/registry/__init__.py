@@ -3,10 +3,11 @@
 from .action import action, ActionController, ActionRegistry, ActionMeta
 from .trigger import trigger, TriggerController, TriggerRegistry, TriggerMeta
 from .controller import ActionTriggerMeta
+from .validator import ParameterValidator
 
 __all__ = [
     "action", "ActionController", "ActionRegistry", "ActionMeta",
     "trigger", "TriggerController", "TriggerRegistry", "TriggerMeta",
-    "ActionTriggerMeta"
+    "ActionTriggerMeta", "ParameterValidator"
 ]
 
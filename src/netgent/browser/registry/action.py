@@ -5,10 +5,11 @@ This module provides a decorator (@action) and metaclass-based system for
 automatically collecting and executing controller actions.
 """
 
-import inspect
 from abc import ABCMeta
 from typing import Callable, Dict, Any, Optional
 
+from .validator import ParameterValidator
+
 
 def action(name: Optional[str] = None, **meta):
     def deco(fn: Callable) -> Callable:
@@ -52,6 +53,7 @@ class ActionRegistry:
     def __init__(self, controller: Any):
         self.controller = controller
         self.actions: Dict[str, Callable] = {}
+        self.validators: Dict[str, ParameterValidator] = {}
         self._bind_actions()
 
     def _bind_actions(self):
@@ -61,6 +63,7 @@ class ActionRegistry:
             method = getattr(self.controller, attr_name, None)
             if callable(method):
                 self.actions[action_name] = method
+                self.validators[action_name] = ParameterValidator(method)
 
     def get_action(self, action_name: str) -> Callable:
         try:
@@ -79,12 +82,30 @@ class ActionRegistry:
         """Get all registered actions."""
         return dict(self.actions)
 
+    def _bind_params(self, action_name: str, params: Dict[str, Any] | None) -> Dict[str, Any]:
+        """Validate params against the action's precompiled signature."""
+        validator = self.validators[action_name]
+
+        # Filter out 'self' from params (shouldn't be present, but be safe)
+        kwargs = {k: v for k, v in (params or {}).items() if k != 'self'}
+
+        try:
+            return validator.bind(kwargs)
+        except TypeError as e:
+            # Provide clearer error message
+            provided = list(kwargs.keys())
+            raise TypeError(
+                f"Invalid parameters for action '{action_name}': {e}\n"
+                f"  Required: {validator.required_names}\n"
+                f"  Provided: {provided}"
+            ) from e
+
     def execute(self, action_name: str, params: Dict[str, Any] | None = None) -> Any:
         """
         Execute an action with strict parameter validation.
         
-        Uses inspect.signature.bind() for validation that catches
-        both missing and unexpected parameters.
+        Uses a ParameterValidator compiled when the action was bound, which
+        catches both missing and unexpected parameters.
         
         Args:
             action_name: Name of the action to execute
@@ -97,32 +118,9 @@ class ActionRegistry:
             KeyError: If action not found
             TypeError: If parameters don't match signature
         """
-        params = params or {}
         method = self.get_action(action_name)
-        sig = inspect.signature(method)
-
-        # Filter out 'self' from params (shouldn't be present, but be safe)
-        kwargs = {k: v for k, v in params.items() if k != 'self'}
-
-        try:
-            # Use bind() for strict validation
-            # Method is already bound to instance, so don't pass self
-            bound = sig.bind(**kwargs)
-            bound.apply_defaults()
-        except TypeError as e:
-            # Provide clearer error message
-            param_names = [
-                p.name for p in sig.parameters.values() 
-                if p.name != 'self' and p.default is inspect.Parameter.empty
-            ]
-            provided = list(kwargs.keys())
-            raise TypeError(
-                f"Invalid parameters for action '{action_name}': {e}\n"
-                f"  Required: {param_names}\n"
-                f"  Provided: {provided}"
-            ) from e
-        
-        return method(**bound.arguments)
+        arguments = self._bind_params(action_name, params)
+        return method(**arguments)
 
     async def aexecute(self, action_name: str, params: Dict[str, Any] | None = None) -> Any:
         """
@@ -141,30 +139,12 @@ class ActionRegistry:
             KeyError: If action not found
             TypeError: If parameters don't match signature
         """
-        params = params or {}
         method = self.get_action(action_name)
-        sig = inspect.signature(method)
-        
-        kwargs = {k: v for k, v in params.items() if k != 'self'}
-        
-        try:
-            bound = sig.bind(**kwargs)
-            bound.apply_defaults()
-        except TypeError as e:
-            param_names = [
-                p.name for p in sig.parameters.values() 
-                if p.name != 'self' and p.default is inspect.Parameter.empty
-            ]
-            provided = list(kwargs.keys())
-            raise TypeError(
-                f"Invalid parameters for action '{action_name}': {e}\n"
-                f"  Required: {param_names}\n"
-                f"  Provided: {provided}"
-            ) from e
+        arguments = self._bind_params(action_name, params)
 
-        if inspect.iscoroutinefunction(method):
-            return await method(**bound.arguments)
-        return method(**bound.arguments)
+        if self.validators[action_name].is_coroutine:
+            return await method(**arguments)
+        return method(**arguments)
     
     def get_action_metadata(self, action_name: str) -> Dict[str, Any]:
         """
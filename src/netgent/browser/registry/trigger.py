@@ -5,10 +5,11 @@ This module provides a decorator (@trigger) and metaclass-based system for
 automatically collecting and executing controller triggers.
 """
 
-import inspect
 from abc import ABCMeta
 from typing import Callable, Dict, Any, Optional
 
+from .validator import ParameterValidator
+
 
 def trigger(name: Optional[str] = None, **meta):
     """Decorator to mark a method as a trigger."""
@@ -53,6 +54,7 @@ class TriggerRegistry:
     def __init__(self, controller: Any):
         self.controller = controller
         self.triggers: Dict[str, Callable] = {}
+        self.validators: Dict[str, ParameterValidator] = {}
         self._bind_triggers()
 
     def _bind_triggers(self):
@@ -62,6 +64,7 @@ class TriggerRegistry:
             method = getattr(self.controller, attr_name, None)
             if callable(method):
                 self.triggers[trigger_name] = method
+                self.validators[trigger_name] = ParameterValidator(method)
 
     def get_trigger(self, trigger_name: str) -> Callable:
         try:
@@ -84,8 +87,8 @@ class TriggerRegistry:
         """
         Check a trigger with strict parameter validation.
         
-        Uses inspect.signature.bind() for validation that catches
-        both missing and unexpected parameters.
+        Uses a ParameterValidator compiled when the trigger was bound, which
+        catches both missing and unexpected parameters.
         
         Args:
             trigger_name: Name of the trigger to check
@@ -98,32 +101,24 @@ class TriggerRegistry:
             KeyError: If trigger not found
             TypeError: If parameters don't match signature
         """
-        params = params or {}
         method = self.get_trigger(trigger_name)
-        sig = inspect.signature(method)
+        validator = self.validators[trigger_name]
 
         # Filter out 'self' from params (shouldn't be present, but be safe)
-        kwargs = {k: v for k, v in params.items() if k != 'self'}
+        kwargs = {k: v for k, v in (params or {}).items() if k != 'self'}
 
         try:
-            # Use bind() for strict validation
-            # Method is already bound to instance, so don't pass self
-            bound = sig.bind(**kwargs)
-            bound.apply_defaults()
+            arguments = validator.bind(kwargs)
         except TypeError as e:
             # Provide clearer error message
-            param_names = [
-                p.name for p in sig.parameters.values() 
-                if p.name != 'self' and p.default is inspect.Parameter.empty
-            ]
             provided = list(kwargs.keys())
             raise TypeError(
                 f"Invalid parameters for trigger '{trigger_name}': {e}\n"
-                f"  Required: {param_names}\n"
+                f"  Required: {validator.required_names}\n"
                 f"  Provided: {provided}"
             ) from e
         
-        return method(**bound.arguments)
+        return method(**arguments)
 
     def get_trigger_metadata(self, trigger_name: str) -> Dict[str, Any]:
         """
@@ -0,0 +1,47 @@
+"""
+Precompiled parameter validation for registered actions and triggers.
+
+Inspecting a method's signature and binding it on every call dominates the cost
+of dispatching cheap triggers. A ParameterValidator is built once per method
+when the registry binds it and validates keyword arguments with set operations.
+"""
+
+import inspect
+from typing import Any, Callable, Dict
+
+
+class ParameterValidator:
+    """Validates keyword arguments against a method signature compiled up front."""
+
+    __slots__ = ("signature", "names", "required", "required_names", "defaults", "is_coroutine", "_fast")
+
+    def __init__(self, method: Callable):
+        self.signature = inspect.signature(method)
+        parameters = [p for p in self.signature.parameters.values() if p.name != 'self']
+
+        self.names = frozenset(p.name for p in parameters)
+        self.required_names = [p.name for p in parameters if p.default is inspect.Parameter.empty]
+        self.required = frozenset(self.required_names)
+        self.defaults = {
+            p.name: p.default for p in parameters if p.default is not inspect.Parameter.empty
+        }
+        self.is_coroutine = inspect.iscoroutinefunction(method)
+        # Only plain keyword-compatible parameters take the set-comparison path
+        self._fast = all(p.kind is inspect.Parameter.POSITIONAL_OR_KEYWORD or p.kind is inspect.Parameter.KEYWORD_ONLY for p in parameters)
+
+    def bind(self, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Return the full keyword arguments for a call, with defaults applied.
+
+        Raises:
+            TypeError: With the same message as inspect.Signature.bind()
+        """
+        if self._fast:
+            keys = kwargs.keys()
+            if self.required <= keys and keys <= self.names:
+                return {**self.defaults, **kwargs}
+
+        # Slow path: let inspect produce the exact error (or handle *args/**kwargs)
+        bound = self.signature.bind(**kwargs)
+        bound.apply_defaults()
+        return bound.arguments
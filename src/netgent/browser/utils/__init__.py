@@ -2,13 +2,37 @@
 Browser utility functions for DOM manipulation and element detection.
 """
 
+from .page_scripts import install_page_scripts, call_page_function
 from .mark_dom import mark_dom, unmark_dom, mark_page
+from .parse_dom import parse_dom, DomSnapshot
+from .screenshot import ScreenshotPipeline, difference_hash
+from .element_prompt import ElementPrompt, estimate_tokens
 from .find_trigger import find_trigger
+from .check_triggers import compile_check, check_triggers, inspect_triggers, url_spec, element_spec, text_spec
+from .locate import resolve_element
+from .wait_for_change import arm_change_watcher, wait_for_change
 
 __all__ = [
+    "install_page_scripts",
+    "call_page_function",
     "mark_dom",
     "unmark_dom", 
     "mark_page",
+    "parse_dom",
+    "DomSnapshot",
+    "ScreenshotPipeline",
+    "difference_hash",
+    "ElementPrompt",
+    "estimate_tokens",
     "find_trigger",
+    "compile_check",
+    "check_triggers",
+    "inspect_triggers",
+    "url_spec",
+    "element_spec",
+    "text_spec",
+    "resolve_element",
+    "arm_change_watcher",
+    "wait_for_change",
 ]
 
@@ -406,6 +406,8 @@
       xpath: item.xpath,
       ariaRole: item.ariaRole,
       accessibleName: item.accessibleName,
+      // Used to rank trigger candidates by their position on the page
+      viewport: item.viewport,
     }));
   }
 
@@ -469,7 +471,4 @@
   window.highlightVisibleElements = highlightVisibleElements;
   window.getTopmostElement = getTopmostElement;
   window.getCurrentTopLayer = getCurrentTopLayer;
-
-  const visibleElements = highlightVisibleElements();
-  return visibleElements || [];
 })();
@@ -5,6 +5,10 @@ window.getDomSnapshot = (args) => {
     viewportExpansion,
     debugMode,
     filterEmptyElements = true,
+    incremental = false,
+    baseVersion = null,
+    baseToken = null,
+    includeTextNodes = false,
   } = args;
   let highlightIndex = 0; // Reset highlight index
 
@@ -57,9 +61,112 @@ window.getDomSnapshot = (args) => {
   }
 
   const DOM_HASH_MAP = {};
+  // Text nodes are folded into their parent's displayText, and only sent
+  // over CDP with includeTextNodes
+  const TEXT_NODE_MAP = includeTextNodes ? DOM_HASH_MAP : {};
   const ID = { current: 0 };
   const HIGHLIGHT_CONTAINER_ID = "playwright-highlight-container";
   const xpathCache = new WeakMap();
+  // Above this many mutations since the last snapshot a delta is not worth it
+  const FULL_SNAPSHOT_MUTATIONS = 2000;
+
+  function isOwnMutation(record) {
+    const nodes = [...record.addedNodes, ...record.removedNodes];
+    if (nodes.length && nodes.every((n) => n.id === HIGHLIGHT_CONTAINER_ID)) {
+      return true;
+    }
+    const target =
+      record.target.nodeType === Node.ELEMENT_NODE
+        ? record.target
+        : record.target.parentElement;
+    return !!target?.closest?.(`#${HIGHLIGHT_CONTAINER_ID}`);
+  }
+
+  // State kept between incremental snapshots of the same document
+  function getSnapshotState() {
+    let state = window.__netgentSnapshotState;
+    if (!state) {
+      state = {
+        // Identifies this document, whose version counter and node IDs start
+        // from 0 like those of any other document
+        token:
+          window.crypto && window.crypto.randomUUID
+            ? window.crypto.randomUUID()
+            : `${Date.now().toString(36)}-${Math.random().toString(36).slice(2)}`,
+        nodeIds: new WeakMap(),
+        nextId: 0,
+        version: 0,
+        serialized: new Map(),
+        mutations: 0,
+      };
+      state.observer = new MutationObserver((records) => {
+        for (const record of records) {
+          if (!isOwnMutation(record)) state.mutations++;
+        }
+      });
+      state.observer.observe(document, {
+        subtree: true,
+        childList: true,
+        attributes: true,
+        characterData: true,
+      });
+      window.__netgentSnapshotState = state;
+    }
+    return state;
+  }
+
+  const SNAPSHOT_STATE = incremental ? getSnapshotState() : null;
+
+  // IDs are stable per DOM node in incremental mode, sequential otherwise
+  function assignId(node) {
+    if (!SNAPSHOT_STATE) return `${ID.current++}`;
+    let id = SNAPSHOT_STATE.nodeIds.get(node);
+    if (id === undefined) {
+      id = `${SNAPSHOT_STATE.nextId++}`;
+      SNAPSHOT_STATE.nodeIds.set(node, id);
+    }
+    return id;
+  }
+
+  // Reduces the map to the nodes added or changed since the snapshot at
+  // baseVersion, plus the IDs of the nodes that disappeared
+  function diffSnapshot(rootId) {
+    const state = SNAPSHOT_STATE;
+    // Drop the records of our own highlight overlays before they are delivered
+    state.observer.takeRecords();
+    const full =
+      baseToken !== state.token ||
+      baseVersion !== state.version ||
+      state.mutations > FULL_SNAPSHOT_MUTATIONS;
+    const serialized = new Map();
+    const changed = {};
+    for (const id in DOM_HASH_MAP) {
+      const value = JSON.stringify(DOM_HASH_MAP[id]);
+      serialized.set(id, value);
+      if (full || state.serialized.get(id) !== value) {
+        changed[id] = DOM_HASH_MAP[id];
+      }
+    }
+    const removed = [];
+    if (!full) {
+      for (const id of state.serialized.keys()) {
+        if (!serialized.has(id)) removed.push(id);
+      }
+    }
+    const mutations = state.mutations;
+    state.serialized = serialized;
+    state.mutations = 0;
+    state.version++;
+    return {
+      rootId,
+      map: changed,
+      removed,
+      full,
+      version: state.version,
+      token: state.token,
+      mutations,
+    };
+  }
 
   function highlightElement(element, index, parentIframe = null) {
     if (!element) return index;
@@ -1074,12 +1181,48 @@ window.getDomSnapshot = (args) => {
       height: rect.height,
       x: rect.left + window.scrollX,
       y: rect.top + window.scrollY,
+      // Strictly within the viewport, regardless of viewportExpansion
+      inViewport:
+        rect.bottom > 0 &&
+        rect.right > 0 &&
+        rect.top < window.innerHeight &&
+        rect.left < window.innerWidth,
       ariaRole,
       text,
       accessibleName,
     };
   }
 
+  // The text shown for a highlighted element: its own text nodes, else the
+  // first non-empty labelling attribute
+  function getDisplayText(nodeData) {
+    const textParts = [];
+    for (const childId of nodeData.children) {
+      const child = TEXT_NODE_MAP[childId];
+      if (child && child.type === "TEXT_NODE") textParts.push(child.text);
+    }
+    if (textParts.length) return textParts.join(" ");
+    for (const name of ["aria-label", "title", "alt", "placeholder", "value"]) {
+      const value = nodeData.attributes[name];
+      if (value) return value.trim();
+    }
+    return "";
+  }
+
+  function finalizeNode(node, nodeData) {
+    if (nodeData.highlightIndex !== undefined) {
+      nodeData.displayText = getDisplayText(nodeData);
+    }
+    if (!includeTextNodes) {
+      nodeData.children = nodeData.children.filter(
+        (childId) => !(childId in TEXT_NODE_MAP)
+      );
+    }
+    const id = assignId(node);
+    DOM_HASH_MAP[id] = nodeData;
+    return id;
+  }
+
   function buildDomTree(
     node,
     parentIframe = null,
@@ -1103,9 +1246,7 @@ window.getDomSnapshot = (args) => {
         const domElement = buildDomTree(child, parentIframe, false);
         if (domElement) nodeData.children.push(domElement);
       }
-      const id = `${ID.current++}`;
-      DOM_HASH_MAP[id] = nodeData;
-      return id;
+      return finalizeNode(node, nodeData);
     }
     if (node.nodeType !== Node.ELEMENT_NODE && node.nodeType !== Node.TEXT_NODE)
       return null;
@@ -1115,8 +1256,8 @@ window.getDomSnapshot = (args) => {
       const parentElement = node.parentElement;
       if (!parentElement || parentElement.tagName.toLowerCase() === "script")
         return null;
-      const id = `${ID.current++}`;
-      DOM_HASH_MAP[id] = {
+      const id = assignId(node);
+      TEXT_NODE_MAP[id] = {
         type: "TEXT_NODE",
         text: textContent,
         isVisible: isTextNodeVisible(node),
@@ -1290,12 +1431,11 @@ window.getDomSnapshot = (args) => {
       }
     }
 
-    const id = `${ID.current++}`;
-    DOM_HASH_MAP[id] = nodeData;
-    return id;
+    return finalizeNode(node, nodeData);
   }
 
   DOM_CACHE.clearCache();
   const rootId = buildDomTree(document.body);
+  if (SNAPSHOT_STATE) return diffSnapshot(rootId);
   return { rootId, map: DOM_HASH_MAP };
 };
@@ -0,0 +1,119 @@
+from typing import Any, Optional
+from .page_scripts import call_page_function
+
+# Trigger types that can be evaluated in-page, with their (required, optional) params
+BATCHABLE_TRIGGERS = {
+    "element": ({"by", "selector"}, {"check_visibility", "timeout"}),
+    "text": ({"text"}, {"check_visibility", "timeout"}),
+    "url": ({"url"}, set()),
+}
+
+# Checks with an explicit wait longer than this are left to the registry
+MAX_PROBE_TIMEOUT = 0.1
+
+
+def compile_check(check: dict) -> Optional[dict[str, Any]]:
+    """
+    Compiles a state check into a spec understood by window.checkTriggers (locate.js).
+
+    Args:
+        check: A state check of the form {"type": ..., "params": {...}}
+
+    Returns:
+        The in-page spec for the check, or None if the check cannot be batched
+        (unknown trigger type, parameters that would not bind, or an explicit
+        wait longer than MAX_PROBE_TIMEOUT).
+    """
+    trigger_type = check.get("type")
+    if trigger_type not in BATCHABLE_TRIGGERS:
+        return None
+
+    params = check.get("params", {}) or {}
+    required, optional = BATCHABLE_TRIGGERS[trigger_type]
+    if not required.issubset(params) or not set(params).issubset(required | optional):
+        return None
+    if params.get("timeout", MAX_PROBE_TIMEOUT) > MAX_PROBE_TIMEOUT:
+        return None
+
+    check_visibility = bool(params.get("check_visibility", True))
+    if trigger_type == "url":
+        return url_spec(params["url"])
+    if trigger_type == "element":
+        return element_spec(params["by"], params["selector"], check_visibility)
+    return text_spec(params["text"], check_visibility)
+
+
+def url_spec(url: str) -> dict[str, Any]:
+    return {"type": "url", "url": url}
+
+
+def element_spec(by: str, selector: str, check_visibility: bool = True) -> dict[str, Any]:
+    return {
+        "type": "element",
+        "by": by,
+        "selector": selector,
+        "checkVisibility": check_visibility,
+    }
+
+
+def text_spec(text: str, check_visibility: bool = True) -> dict[str, Any]:
+    # Same XPath as BaseController.check_text
+    return {
+        "type": "text",
+        "xpath": f"//*[normalize-space(text())='{text}']",
+        "checkVisibility": check_visibility,
+    }
+
+
+def check_triggers(driver, specs: list[dict[str, Any]]) -> list[bool]:
+    """
+    Evaluates compiled trigger specs in a single Runtime.evaluate call.
+
+    Args:
+        driver: The Selenium WebDriver instance
+        specs: Specs produced by compile_check
+
+    Returns:
+        A list of booleans, one per spec, in the same order.
+    """
+    if not specs:
+        return []
+
+    try:
+        result = call_page_function(driver, "checkTriggers", specs)
+    except Exception as e:
+        raise Exception(f"Failed to check triggers: {str(e)}")
+
+    values = result.get("result", {}).get("value")
+    if not isinstance(values, list) or len(values) != len(specs):
+        raise Exception(f"Failed to check triggers: unexpected result {result}")
+    return [bool(value) for value in values]
+
+
+def inspect_triggers(driver, specs: list[dict[str, Any]]) -> list[Optional[dict[str, Any]]]:
+    """
+    Evaluates compiled trigger specs against the current page for validation.
+
+    Args:
+        driver: The Selenium WebDriver instance
+        specs: Specs produced by compile_check
+
+    Returns:
+        One entry per spec (None if it could not be evaluated), with:
+        matches: Number of elements matched (1/0 for url specs)
+        visible: Whether the first match is visible and in the viewport
+        ms: Mean in-page evaluation time of the check, in milliseconds
+        cssSelector: A CSS selector unique to the first match, if one was found
+    """
+    if not specs:
+        return []
+
+    try:
+        result = call_page_function(driver, "inspectTriggers", specs)
+    except Exception as e:
+        raise Exception(f"Failed to inspect triggers: {str(e)}")
+
+    values = result.get("result", {}).get("value")
+    if not isinstance(values, list) or len(values) != len(specs):
+        raise Exception(f"Failed to inspect triggers: unexpected result {result}")
+    return values
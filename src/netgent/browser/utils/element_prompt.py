@@ -0,0 +1,185 @@
+import re
+from functools import lru_cache
+from typing import Callable, Optional
+
+# Rough characters per token when no tokenizer is installed
+CHARS_PER_TOKEN = 4
+# Structurally identical elements collapsed once there are this many of them
+REPEAT_THRESHOLD = 4
+# Elements of a collapsed group that stay in the prompt
+REPEAT_KEEP = 3
+
+INTERACTIVE_TAGS = {"a", "button", "input", "select", "textarea", "summary", "option"}
+INTERACTIVE_ROLES = {
+    "button", "link", "checkbox", "radio", "switch", "tab", "menuitem",
+    "option", "textbox", "searchbox", "combobox", "slider",
+}
+
+_XPATH_INDEX = re.compile(r"\[\d+\]")
+
+
+@lru_cache(maxsize=1)
+def _encoding():
+    try:
+        import tiktoken
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception:
+        # Not installed, or the encoding could not be downloaded (e.g. offline)
+        return None
+
+
+def estimate_tokens(text: str) -> int:
+    """Token count of `text` with tiktoken if it is installed, else a character estimate."""
+    encoding = _encoding()
+    if encoding is None:
+        return -(-len(text) // CHARS_PER_TOKEN)
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+class ElementPrompt:
+    """
+    Renders the element listing of a page within a token budget.
+
+    A listing that fits the budget is returned unchanged. Otherwise, it is
+    reduced in steps until it fits:
+
+    1. Elements repeating the tag, text and label of an earlier element (e.g.
+       a navigation bar duplicated in the footer) are dropped.
+    2. Repeated elements are collapsed to their first REPEAT_KEEP entries and
+       a note. Elements are repeated when they share their XPath up to sibling
+       indices, and either share their labels or sit in repeated items that
+       hold several elements (feed cards, video tiles). Distinct labelled
+       controls standing on their own, such as the links of a menu, are kept.
+    3. Elements are kept by priority: in the viewport, then natively
+       interactive, then labelled.
+
+    The listing stays in highlight index order. Only the prompt is shortened;
+    every element remains in the elements dict.
+
+    Args:
+        token_budget: Upper bound on the tokens of the listing
+        count_tokens: Token counter for a line of text; defaults to estimate_tokens
+
+    After render, `omitted` holds the number of elements left out of the listing.
+    """
+
+    def __init__(self, token_budget: int, count_tokens: Optional[Callable[[str], int]] = None):
+        self.token_budget = token_budget
+        self.count_tokens = count_tokens or estimate_tokens
+        self.omitted = 0
+
+    def render(self, records: list) -> str:
+        """Renders ElementRecords sorted by highlight index."""
+        lines = [record.label() for record in records]
+        # Each line also costs its newline
+        costs = [self.count_tokens(line) + 1 for line in lines]
+        self.omitted = 0
+        if sum(costs) <= self.token_budget:
+            return "\n".join(lines)
+
+        kept, notes = self._collapse(records)
+        note_costs = {position: self.count_tokens(note) + 1 for position, (_, note) in notes.items()}
+        if sum(costs[position] for position in kept) + sum(note_costs.values()) > self.token_budget:
+            kept = self._select(records, kept, costs, note_costs)
+
+        output = []
+        # Elements left out without a note standing for them
+        unmentioned = len(records) - len(kept)
+        for position in kept:
+            output.append(lines[position])
+            if position in notes:
+                count, note = notes[position]
+                output.append(note)
+                unmentioned -= count
+        if unmentioned:
+            output.append(f"... {unmentioned} more elements omitted to fit the token budget")
+        self.omitted = len(records) - len(kept)
+        return "\n".join(output)
+
+    def _collapse(self, records: list) -> tuple[list[int], dict[int, str]]:
+        """
+        Drops duplicated elements and collapses repeated ones.
+
+        Returns:
+            The positions of the remaining records, and (count, note) pairs
+            for the collapsed records keyed by the position they follow
+        """
+        seen = set()
+        unique = []
+        for position, record in enumerate(records):
+            if record.text or record.accessible_name:
+                key = (record.tag_name, record.text, record.accessible_name)
+                if key in seen:
+                    continue
+                seen.add(key)
+            unique.append(position)
+
+        groups = {}
+        for position in unique:
+            signature = _signature(records[position])
+            if signature is not None:
+                groups.setdefault(signature, []).append(position)
+
+        # Number of listed elements under every XPath prefix, to size repeated items
+        prefix_counts = {}
+        for position in unique:
+            xpath = records[position].metadata.get("xpath") or ""
+            segments = xpath.split("/")
+            for end in range(1, len(segments) + 1):
+                prefix = "/".join(segments[:end])
+                prefix_counts[prefix] = prefix_counts.get(prefix, 0) + 1
+
+        collapsed, notes = set(), {}
+        for members in groups.values():
+            if len(members) >= REPEAT_THRESHOLD and _is_repeated([records[position] for position in members], prefix_counts):
+                collapsed.update(members[REPEAT_KEEP:])
+                count = len(members) - REPEAT_KEEP
+                notes[members[REPEAT_KEEP - 1]] = (count, f"... {count} more similar <{records[members[0]].tag_name}/> elements")
+        return [position for position in unique if position not in collapsed], notes
+
+    def _select(self, records: list, kept: list[int], costs: list[int], note_costs: dict[int, int]) -> list[int]:
+        """Positions of the highest priority lines that fit the budget, in order."""
+        # Reserve room for the closing note
+        budget = self.token_budget - self.count_tokens(f"... {len(records)} more elements omitted to fit the token budget") - 1
+        order = sorted(kept, key=lambda position: (-_priority(records[position]), position))
+        selected = []
+        for position in order:
+            cost = costs[position] + note_costs.get(position, 0)
+            if cost <= budget:
+                selected.append(position)
+                budget -= cost
+        return sorted(selected)
+
+
+def _signature(record) -> Optional[str]:
+    xpath = record.metadata.get("xpath")
+    return _XPATH_INDEX.sub("", xpath) if xpath else None
+
+
+def _is_repeated(records: list, prefix_counts: dict[str, int]) -> bool:
+    """
+    Whether elements sharing a signature are repetitions rather than distinct controls:
+    most share their labels, or each sits in a repeated item holding several elements.
+    """
+    labels = {(record.text, record.accessible_name) for record in records}
+    if len(labels) <= len(records) // 2:
+        return True
+
+    # The repeated item is the XPath prefix up to the first segment that differs
+    paths = [record.metadata["xpath"].split("/") for record in records]
+    depth = next((i for i in range(len(paths[0])) if any(path[i] != paths[0][i] for path in paths)), None)
+    if depth is None:
+        return False
+    return all(prefix_counts.get("/".join(path[:depth + 1]), 0) > 1 for path in paths)
+
+
+def _priority(record) -> int:
+    priority = 0
+    if record.in_viewport:
+        priority += 4
+    role = record.metadata.get("ariaRole", "")
+    if record.tag_name in INTERACTIVE_TAGS or role in INTERACTIVE_ROLES:
+        priority += 2
+    if record.text or record.accessible_name:
+        priority += 1
+    return priority
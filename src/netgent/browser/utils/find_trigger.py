@@ -1,15 +1,13 @@
-import os
-import json
 from typing import Any
+from .page_scripts import SCRIPTS, call_page_function
 
-with open(os.path.join(os.path.dirname(__file__), 'avaliable_trigger.js'), 'r') as f:
-    AVAILABLE_TRIGGER_SCRIPT = f.read()
+AVAILABLE_TRIGGER_SCRIPT = SCRIPTS['avaliable_trigger.js']
 
 def find_trigger(driver) -> list[dict[str, Any]]:
     """
     Finds potential trigger elements in the DOM.
     
-    This function executes the available_trigger.js script which finds visible elements
+    This function calls the available_trigger.js helpers which find visible elements
     on the page that can potentially be interacted with (triggers).
     
     Args:
@@ -18,27 +16,11 @@ def find_trigger(driver) -> list[dict[str, Any]]:
     Returns:
         A list of dictionaries containing information about each visible trigger element.
         Each dict contains: tagName, id, text, cssSelector, enhancedCssSelector, 
-        xpath, ariaRole, accessibleName
+        xpath, ariaRole, accessibleName, viewport (its rect in the viewport)
     """
     try:
-        # First check if the function is already loaded
-        check_script = "typeof window.highlightVisibleElements !== 'undefined';"
-        is_loaded = driver.execute_cdp_cmd("Runtime.evaluate", {
-            "expression": check_script, 
-            "returnByValue": True
-        })["result"]["value"]
-        
-        # If not loaded, inject the script
-        if not is_loaded:
-            driver.execute_cdp_cmd("Runtime.evaluate", {
-                "expression": AVAILABLE_TRIGGER_SCRIPT
-            })
-        
-        # Execute the script and get results
-        result = driver.execute_cdp_cmd("Runtime.evaluate", {
-            "expression": AVAILABLE_TRIGGER_SCRIPT,
-            "returnByValue": True
-        })
+        # avaliable_trigger.js is registered for every new document, so this is a single call
+        result = call_page_function(driver, "highlightVisibleElements")
         
         # Handle the CDP response structure properly
         if "result" in result and "value" in result["result"]:
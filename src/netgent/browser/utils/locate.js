@@ -0,0 +1,243 @@
+(() => {
+  // Mirrors BaseController.is_element_visible_in_viewpoint
+  function isVisibleInViewport(elem) {
+    const style = window.getComputedStyle(elem);
+    const rect = elem.getBoundingClientRect();
+
+    const isVisible =
+      style.display !== "none" &&
+      style.visibility !== "hidden" &&
+      style.opacity !== "0";
+
+    const isInViewport =
+      rect.top >= 0 &&
+      rect.left >= 0 &&
+      rect.bottom <=
+        (window.innerHeight || document.documentElement.clientHeight) &&
+      rect.right <= (window.innerWidth || document.documentElement.clientWidth);
+
+    return isVisible && isInViewport;
+  }
+
+  function evaluateXPath(xpath) {
+    return document.evaluate(
+      xpath,
+      document,
+      null,
+      XPathResult.FIRST_ORDERED_NODE_TYPE,
+      null
+    ).singleNodeValue;
+  }
+
+  function findLink(text, partial) {
+    for (const link of document.querySelectorAll("a")) {
+      const linkText = (link.innerText || "").trim();
+      if (partial ? linkText.includes(text) : linkText === text) {
+        return link;
+      }
+    }
+    return null;
+  }
+
+  // Resolves the first element matched by a Selenium locator strategy
+  function locate(by, selector) {
+    switch (by) {
+      case "css selector":
+        return document.querySelector(selector);
+      case "xpath":
+        return evaluateXPath(selector);
+      case "id":
+        return document.getElementById(selector);
+      case "name":
+        return document.getElementsByName(selector)[0] || null;
+      case "class name":
+        return document.getElementsByClassName(selector)[0] || null;
+      case "tag name":
+        return document.getElementsByTagName(selector)[0] || null;
+      case "link text":
+        return findLink(selector, false);
+      case "partial link text":
+        return findLink(selector, true);
+      default:
+        throw new Error(`Unsupported locator strategy: ${by}`);
+    }
+  }
+
+  function checkElement(element, checkVisibility) {
+    if (!element || element.nodeType !== Node.ELEMENT_NODE) return false;
+    return checkVisibility ? isVisibleInViewport(element) : true;
+  }
+
+  // Same fields as VIEWPORT_GEOMETRY_SCRIPT in controller/base.py
+  function viewportGeometry() {
+    return {
+      scrollX: window.pageXOffset || document.documentElement.scrollLeft,
+      scrollY: window.pageYOffset || document.documentElement.scrollTop,
+      panelWidth: window.outerWidth - window.innerWidth,
+      panelHeight: window.outerHeight - window.innerHeight,
+      innerWidth: window.innerWidth,
+      innerHeight: window.innerHeight,
+      screenX: window.screenX,
+      screenY: window.screenY,
+      outerWidth: window.outerWidth,
+      outerHeight: window.outerHeight,
+    };
+  }
+
+  function describeElement(element) {
+    const rect = element.getBoundingClientRect();
+    const geometry = viewportGeometry();
+    return {
+      document: {
+        x: rect.left + geometry.scrollX,
+        y: rect.top + geometry.scrollY,
+        width: rect.width,
+        height: rect.height,
+      },
+      viewport: {
+        x: rect.left,
+        y: rect.top,
+        width: rect.width,
+        height: rect.height,
+      },
+      visible: isVisibleInViewport(element),
+      geometry,
+    };
+  }
+
+  window.checkTriggers = (checks) =>
+    checks.map((check) => {
+      try {
+        switch (check.type) {
+          case "url":
+            return window.location.href === check.url;
+          case "element":
+            return checkElement(
+              locate(check.by, check.selector),
+              check.checkVisibility
+            );
+          case "text":
+            return checkElement(
+              evaluateXPath(check.xpath),
+              check.checkVisibility
+            );
+          default:
+            return false;
+        }
+      } catch (e) {
+        return false;
+      }
+    });
+
+  function countMatches(by, selector) {
+    switch (by) {
+      case "css selector":
+        return document.querySelectorAll(selector).length;
+      case "xpath":
+        return document.evaluate(
+          selector,
+          document,
+          null,
+          XPathResult.ORDERED_NODE_SNAPSHOT_TYPE,
+          null
+        ).snapshotLength;
+      default:
+        return locate(by, selector) ? 1 : 0;
+    }
+  }
+
+  // An id or attribute CSS selector matching only this element, or null;
+  // positional selectors are never returned, as they break on layout changes
+  function uniqueSelector(element) {
+    const isUnique = (selector) => {
+      try {
+        const matches = document.querySelectorAll(selector);
+        return matches.length === 1 && matches[0] === element;
+      } catch (e) {
+        return false;
+      }
+    };
+    // Inside a quoted attribute value only quotes and backslashes need escaping
+    const quote = (value) => `"${value.replace(/["\\]/g, "\\$&")}"`;
+    const tagName = element.tagName.toLowerCase();
+    if (element.id && isUnique(`#${CSS.escape(element.id)}`)) {
+      return `#${CSS.escape(element.id)}`;
+    }
+    for (const name of ["data-testid", "data-test", "data-cy", "aria-label", "name"]) {
+      const value = element.getAttribute(name);
+      const selector = `${tagName}[${name}=${quote(value || "")}]`;
+      if (value && isUnique(selector)) return selector;
+    }
+    return null;
+  }
+
+  // Mean time of a few evaluations, in milliseconds
+  function timeEvaluation(evaluate, runs = 5) {
+    const start = performance.now();
+    for (let i = 0; i < runs; i++) evaluate();
+    return (performance.now() - start) / runs;
+  }
+
+  // Describes how trigger specs (see checkTriggers) behave on the current page
+  window.inspectTriggers = (checks) =>
+    checks.map((check) => {
+      try {
+        switch (check.type) {
+          case "url":
+            return {
+              matches: window.location.href === check.url ? 1 : 0,
+              visible: true,
+              ms: 0,
+              cssSelector: null,
+            };
+          case "element":
+          case "text": {
+            const by = check.type === "text" ? "xpath" : check.by;
+            const selector = check.type === "text" ? check.xpath : check.selector;
+            const element = locate(by, selector);
+            return {
+              matches: countMatches(by, selector),
+              visible: checkElement(element, true),
+              ms: timeEvaluation(() =>
+                checkElement(locate(by, selector), check.checkVisibility)
+              ),
+              cssSelector:
+                element && element.nodeType === Node.ELEMENT_NODE
+                  ? uniqueSelector(element)
+                  : null,
+            };
+          }
+          default:
+            return null;
+        }
+      } catch (e) {
+        return null;
+      }
+    });
+
+  // Waits in-page (frame by frame) for an element, then describes its position
+  window.resolveElement = (by, selector, timeoutMs) =>
+    new Promise((resolve, reject) => {
+      const start = Date.now();
+      function poll() {
+        let element;
+        try {
+          element = locate(by, selector);
+        } catch (e) {
+          reject(e);
+          return;
+        }
+        if (element && element.nodeType === Node.ELEMENT_NODE) {
+          resolve(describeElement(element));
+        } else if (Date.now() - start >= timeoutMs) {
+          resolve(null);
+        } else if (document.visibilityState === "visible") {
+          requestAnimationFrame(poll);
+        } else {
+          // Animation frames are paused in background tabs
+          setTimeout(poll, 50);
+        }
+      }
+      poll();
+    });
+})();
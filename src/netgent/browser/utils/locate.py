@@ -0,0 +1,34 @@
+from typing import Any, Optional
+from .page_scripts import SCRIPTS, call_page_function
+
+LOCATE_SCRIPT = SCRIPTS['locate.js']
+
+
+def resolve_element(driver, by: str, selector: str, timeout: float = 10) -> Optional[dict[str, Any]]:
+    """
+    Resolves an element's position and visibility in a single script execution.
+
+    The lookup is retried in-page on every animation frame until the element is
+    present or the timeout expires, so waiting costs no extra WebDriver commands.
+
+    Args:
+        driver: The Selenium WebDriver instance
+        by: Locator strategy (e.g. "css selector", "xpath", "id")
+        selector: Selector string
+        timeout: Seconds to wait for the element to be present
+
+    Returns:
+        None if the element was not found, otherwise a dict with:
+        document: {x, y, width, height} relative to the document
+        viewport: {x, y, width, height} relative to the viewport
+        visible: Whether the element is visible and fully in the viewport
+        geometry: Viewport geometry (see BaseController.get_viewport_geometry)
+    """
+    try:
+        result = call_page_function(driver, "resolveElement", by, selector, int(timeout * 1000), await_promise=True)
+    except Exception as e:
+        raise Exception(f"Failed to resolve element: {str(e)}")
+
+    if "exceptionDetails" in result:
+        raise Exception(f"Failed to resolve element: {result['exceptionDetails']}")
+    return result.get("result", {}).get("value")
@@ -1,37 +1,42 @@
 import time
-import os
+from concurrent.futures import ThreadPoolExecutor
 from seleniumbase import Driver
 from selenium.webdriver.support.ui import WebDriverWait
-import json
 import base64
 from langchain_core.runnables import chain as chain_decorator
 from selenium.common.exceptions import StaleElementReferenceException
-from .parse_dom import parse_dom
+from .parse_dom import parse_dom, DomSnapshot
 
-with open(os.path.join(os.path.dirname(__file__), 'build_dom.js'), 'r') as f:
-    WEBMARKER_SCRIPT = f.read()
+from .page_scripts import SCRIPTS, call_page_function
+from .screenshot import ScreenshotPipeline
+from .element_prompt import ElementPrompt
 
-def mark_dom(driver, args: dict = None) -> tuple[dict, str, str]:
-    args = args or {
-            "doHighlightElements": True,
-            "focusHighlightIndex": -1,
-            "viewportExpansion": 0,
-            "debugMode": False,
-            "filterEmptyElements": False,
-        }
-    
+WEBMARKER_SCRIPT = SCRIPTS['build_dom.js']
+
+# Runs the screenshot and highlight removal of mark_page next to the parsing
+_capture_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="netgent-capture")
+
+DEFAULT_MARK_ARGS = {
+    "doHighlightElements": True,
+    "focusHighlightIndex": -1,
+    "viewportExpansion": 0,
+    "debugMode": False,
+    "filterEmptyElements": False,
+}
+
+def mark_dom(driver, args: dict = None, screenshots: ScreenshotPipeline = None) -> tuple[dict, str, str]:
     """
-    Loads the webmarker script (if not already present) and executes DOM marking.
+    Executes DOM marking with the webmarker script (injected if not already present).
     The script will highlight all interactable elements.
     """
-    try:
-        # Prepare arguments for the getDomSnapshot function
+    interactable = _snapshot_dom(driver, args)
+    return interactable, _take_screenshot(driver, screenshots)
 
-        
-        if not driver.execute_cdp_cmd("Runtime.evaluate", {"expression": "typeof window.getDomSnapshot !== 'undefined';", "returnByValue": True})["result"]["value"]:
-            driver.execute_cdp_cmd("Runtime.evaluate", {"expression": WEBMARKER_SCRIPT})
-        
-        result = driver.execute_cdp_cmd("Runtime.evaluate", {"expression": f"window.getDomSnapshot({json.dumps(args)});", "returnByValue": True})
+def _snapshot_dom(driver, args: dict = None) -> dict:
+    args = args or DEFAULT_MARK_ARGS
+    try:
+        # build_dom.js is registered for every new document, so this is a single call
+        result = call_page_function(driver, "getDomSnapshot", args)
         
         # Handle the CDP response structure properly
         if "result" in result and "value" in result["result"]:
@@ -43,19 +48,30 @@ def mark_dom(driver, args: dict = None) -> tuple[dict, str, str]:
             interactable = result.get("result", result)
     except Exception as e:
         raise Exception("Failed to mark DOM: " + str(e))
-    
+    return interactable
+
+def _take_screenshot(driver, screenshots: ScreenshotPipeline = None) -> str:
     try: 
-        # Use Selenium's built-in screenshot method which is much faster
-        # and returns base64 encoded PNG data directly
-        screenshot_base64 = driver.get_screenshot_as_base64()
+        if screenshots is not None:
+            screenshot_base64 = screenshots.capture()
+        else:
+            # Use Selenium's built-in screenshot method which is much faster
+            # and returns base64 encoded PNG data directly
+            screenshot_base64 = driver.get_screenshot_as_base64()
 
         # Save the screenshot to a file
         # with open(f"screenshot_{time.time()}.png", "wb") as f:
         #     f.write(base64.b64decode(screenshot_base64))
     except Exception as e:
         raise Exception("Failed to take screenshot: " + str(e))
-    
-    return interactable, screenshot_base64
+    return screenshot_base64
+
+def _take_screenshot_and_unmark(driver, screenshots: ScreenshotPipeline = None) -> str:
+    """Captures the highlighted page, then removes the highlights."""
+    try:
+        return _take_screenshot(driver, screenshots)
+    finally:
+        unmark_dom(driver)
 
 def unmark_dom(driver) -> None:
     """Removes the highlights from the DOM."""
@@ -102,17 +118,38 @@ def unmark_dom(driver) -> None:
     """
     driver.execute_cdp_cmd("Runtime.evaluate", {"expression": unmark_script, "returnByValue": True})
 
-def mark_page(driver: Driver):    
+def mark_page(driver: Driver, snapshot: DomSnapshot = None, screenshots: ScreenshotPipeline = None, element_prompt: ElementPrompt = None):
+    """
+    Marks the page and parses its interactable elements.
+
+    With a DomSnapshot, only the nodes changed since the previous call are
+    transferred and parsed, and merged into the snapshot's element table.
+    With a ScreenshotPipeline, the screenshot is captured through it instead
+    of as a full-resolution PNG. With an ElementPrompt, the element listing is
+    rendered by it, e.g. within a token budget.
+
+    Only the snapshot call blocks: the screenshot and the highlight removal run
+    on a worker thread while the returned map is parsed.
+    """
     @chain_decorator
     def _mark_page(args: dict):
         max_retries = 10
         retry_delay = 2
+        if snapshot is not None:
+            args = {**(args or DEFAULT_MARK_ARGS), **snapshot.snapshot_args()}
         # Retry loop for marking DOM
         for attempt in range(max_retries):
             try:
-                interactable, screenshot = mark_dom(driver, args=args)
-                prompt, elements = parse_dom(interactable)
-                unmark_dom(driver)
+                interactable = _snapshot_dom(driver, args)
+                # The page is captured and unmarked while the DOM map is parsed
+                capture = _capture_executor.submit(_take_screenshot_and_unmark, driver, screenshots)
+                try:
+                    if snapshot is not None:
+                        prompt, elements = snapshot.apply(interactable, element_prompt)
+                    else:
+                        prompt, elements = parse_dom(interactable, element_prompt)
+                finally:
+                    screenshot = capture.result()
                 return elements, prompt, screenshot
                 
             except StaleElementReferenceException as e:
@@ -0,0 +1,87 @@
+import os
+import json
+import logging
+import weakref
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+def _read_script(file_name: str) -> str:
+    with open(os.path.join(os.path.dirname(__file__), file_name), 'r') as f:
+        return f.read()
+
+
+# In-page helpers, each defining functions on window without side effects
+SCRIPTS = {
+    file_name: _read_script(file_name)
+    for file_name in ("build_dom.js", "avaliable_trigger.js", "locate.js", "wait_for_change.js")
+}
+
+# window function -> script that defines it
+PAGE_FUNCTIONS = {
+    "getDomSnapshot": "build_dom.js",
+    "highlightVisibleElements": "avaliable_trigger.js",
+    "checkTriggers": "locate.js",
+    "resolveElement": "locate.js",
+    "inspectTriggers": "locate.js",
+    "armChangeWatcher": "wait_for_change.js",
+    "waitForChange": "wait_for_change.js",
+}
+
+# Returned instead of calling a function the current document does not define
+_MISSING = "__netgent_missing_function__"
+
+_installed_drivers = weakref.WeakSet()
+
+
+def install_page_scripts(driver) -> None:
+    """
+    Registers every page script to run on each new document, once per driver.
+
+    After this, navigations no longer need a check, an injection and a re-parse
+    of the scripts before helpers can be called.
+    """
+    if driver in _installed_drivers:
+        return
+    _installed_drivers.add(driver)
+    for file_name, source in SCRIPTS.items():
+        try:
+            driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": source})
+        except Exception as e:
+            # call_page_function still injects into each document on demand
+            logger.warning(f"Could not register {file_name} for new documents: {e}")
+
+
+def call_page_function(driver, function: str, *args, await_promise: bool = False) -> dict[str, Any]:
+    """
+    Calls window.<function>(*args) in the page with a single Runtime.evaluate.
+
+    Documents created before the scripts were registered do not define the
+    function yet; its script is then injected into the current document and
+    the call retried.
+
+    Args:
+        driver: The Selenium WebDriver instance
+        function: Name of a function listed in PAGE_FUNCTIONS
+        *args: JSON-serializable arguments
+        await_promise: Wait for a returned promise to settle
+
+    Returns:
+        The raw Runtime.evaluate response.
+    """
+    install_page_scripts(driver)
+
+    arguments = ", ".join(json.dumps(arg) for arg in args)
+    params = {
+        "expression": f"typeof window.{function} === 'function' ? window.{function}({arguments}) : {json.dumps(_MISSING)}",
+        "returnByValue": True,
+    }
+    if await_promise:
+        params["awaitPromise"] = True
+
+    result = driver.execute_cdp_cmd("Runtime.evaluate", params)
+    if result.get("result", {}).get("value") == _MISSING:
+        driver.execute_cdp_cmd("Runtime.evaluate", {"expression": SCRIPTS[PAGE_FUNCTIONS[function]]})
+        result = driver.execute_cdp_cmd("Runtime.evaluate", params)
+    return result
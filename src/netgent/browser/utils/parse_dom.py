@@ -1,70 +1,190 @@
-def parse_dom(dom_data):
+def parse_dom(dom_data, element_prompt=None):
     if not dom_data or 'map' not in dom_data:
         return "No DOM data available.", {}
-    
+
     elements_map = dom_data['map']
-    highlighted_elements = []
-    
-    for _, element_data in elements_map.items():
-        highlight_index = element_data.get('highlightIndex', None)
-        if highlight_index is not None and element_data.get('isVisible', False):
-            text = _extract_text_content(element_data, elements_map)
-            tag_name = element_data.get('tagName', 'unknown')
-            metadata = element_data.get('metadata', {})
-            accessible_name = metadata.get('accessibleName', '')
-            
-            highlighted_elements.append({
-                'highlight_index': highlight_index,
-                'tag_name': tag_name,
-                'text': text,
-                'accessible_name': accessible_name,
-                'metadata': metadata,
-                'x': element_data.get('x', 0),
-                'y': element_data.get('y', 0),
-                'width': element_data.get('width', 0),
-                'height': element_data.get('height', 0),
-            })    
-    
-    highlighted_elements.sort(key=lambda x: x['highlight_index'])
-        
-    # Build prompt string
-    prompt = []
-    # Build dictionary with highlight indices as keys
-    elements_dict = {}
-    
-    for element in highlighted_elements:
-        text = element['text']
-        aria_label = element['accessible_name']
-        tag_name = element['tag_name']
-        highlight_index = element['highlight_index']
-        metadata = element['metadata']
-        
+    records = []
+    append = records.append
+    for element_data in elements_map.values():
+        # Most nodes are not highlighted, so test that before anything else
+        if 'highlightIndex' in element_data:
+            record = _element_record(element_data, elements_map)
+            if record is not None:
+                append(record)
+    return _format_elements(records, element_prompt)
+
+
+class ElementRecord:
+    """A highlighted, visible element, as parsed from the DOM map."""
+
+    __slots__ = ("highlight_index", "tag_name", "text", "accessible_name", "in_viewport", "metadata")
+
+    def __init__(self, highlight_index: int, tag_name: str, text: str, accessible_name: str, in_viewport: bool, metadata: dict):
+        self.highlight_index = highlight_index
+        self.tag_name = tag_name
+        self.text = text
+        self.accessible_name = accessible_name
+        self.in_viewport = in_viewport
+        self.metadata = metadata
+
+    def label(self) -> str:
+        """The element's line in the prompt."""
+        text, aria_label = self.text, self.accessible_name
         if text or aria_label:
-            label = f"{highlight_index} (<{tag_name}/>): " + (f"Text: {text}" if text else "") + (f", Aria Label: {aria_label}" if aria_label else "")
-        else:
-            label = f"{highlight_index} (<{tag_name}/>): <empty/>"
-        prompt.append(label)
-            
-            # For the dictionary - updated format
-        elements_dict[str(highlight_index)] = {
+            return f"{self.highlight_index} (<{self.tag_name}/>): " + (f"Text: {text}" if text else "") + (f", Aria Label: {aria_label}" if aria_label else "")
+        return f"{self.highlight_index} (<{self.tag_name}/>): <empty/>"
+
+    def to_dict(self) -> dict:
+        """The element as exposed to actions, keyed like WebAgent.elements."""
+        metadata = self.metadata
+        return {
             'accessible_name': metadata.get('accessibleName', ''),
             'aria_role': metadata.get('ariaRole', ''),
             'css_selector': metadata.get('cssSelector', ''),
             'enhanced_css_selector': metadata.get('enhancedCssSelector', ''),
-            'tag_name': metadata.get('tagName', tag_name),
-            'text': metadata.get('text', text),
+            'tag_name': metadata.get('tagName', self.tag_name),
+            'text': metadata.get('text', self.text),
             'xpath': metadata.get('xpath', ''),
             'x': metadata.get('x', 0),
             'y': metadata.get('y', 0),
             'width': metadata.get('width', 0),
             'height': metadata.get('height', 0),
         }
-    
-    if not prompt:
+
+
+class DomSnapshot:
+    """
+    Persistent element table for incremental DOM snapshots.
+
+    In incremental mode getDomSnapshot only returns the nodes added or changed
+    since the previous snapshot, keyed by IDs that stay stable per DOM node,
+    plus the IDs of removed nodes. A delta is only sent against a snapshot of
+    the same document (identified by a random per-document token) and version;
+    otherwise the page sends a full snapshot. The delta is merged here, and only the
+    affected elements are parsed again.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        self.version = None
+        self.token = None
+        self.nodes = {}
+        self.parents = {}
+        self.elements = {}
+
+    def snapshot_args(self) -> dict:
+        """getDomSnapshot arguments requesting a delta against this table."""
+        return {"incremental": True, "baseVersion": self.version, "baseToken": self.token}
+
+    def apply(self, dom_data, element_prompt=None) -> tuple[str, dict]:
+        """
+        Merges a snapshot into the table.
+
+        Full snapshots replace the table. Deltas only re-parse the changed nodes
+        and their parents, whose text may be drawn from text-node children when
+        the snapshot includes them.
+
+        Returns:
+            The same (prompt, elements) pair as parse_dom over the whole page.
+        """
+        if not dom_data or 'map' not in dom_data:
+            self.reset()
+            return "No DOM data available.", {}
+
+        if dom_data.get('full', True):
+            self.reset()
+
+        dirty = set()
+        for node_id in dom_data.get('removed', []):
+            self.nodes.pop(node_id, None)
+            self.elements.pop(node_id, None)
+            parent_id = self.parents.pop(node_id, None)
+            if parent_id is not None:
+                dirty.add(parent_id)
+
+        for node_id, node in dom_data['map'].items():
+            previous = self.nodes.get(node_id)
+            if previous is not None:
+                for child_id in previous.get('children', []):
+                    if self.parents.get(child_id) == node_id:
+                        del self.parents[child_id]
+            self.nodes[node_id] = node
+            for child_id in node.get('children', []):
+                self.parents[child_id] = node_id
+            dirty.add(node_id)
+
+        # Parents of changed text nodes only change through their children
+        dirty.update(self.parents[node_id] for node_id in list(dirty) if node_id in self.parents)
+
+        for node_id in dirty:
+            node = self.nodes.get(node_id)
+            element = _element_record(node, self.nodes) if node is not None else None
+            if element is None:
+                self.elements.pop(node_id, None)
+            else:
+                self.elements[node_id] = element
+
+        self.version = dom_data.get('version')
+        self.token = dom_data.get('token')
+        return _format_elements(list(self.elements.values()), element_prompt)
+
+
+def _element_record(element_data, elements_map):
+    """The record of a highlighted, visible element, or None for any other node."""
+    highlight_index = element_data.get('highlightIndex')
+    if highlight_index is None or not element_data.get('isVisible', False):
+        return None
+
+    # build_dom.js precomputes the text; older snapshots still carry text nodes
+    text = element_data.get('displayText')
+    if text is None:
+        text = _extract_text_content(element_data, elements_map)
+
+    metadata = element_data.get('metadata', {})
+    return ElementRecord(
+        highlight_index,
+        element_data.get('tagName', 'unknown'),
+        text,
+        metadata.get('accessibleName', ''),
+        metadata.get('inViewport', element_data.get('isInViewport', True)),
+        metadata,
+    )
+
+
+def _format_elements(records, element_prompt=None):
+    """
+    Builds the prompt string and the highlight index -> element dict.
+
+    With an ElementPrompt, the prompt string is rendered by it (e.g. within a
+    token budget); the dict always holds every element.
+    """
+    if not records:
         return "No highlighted elements found.", {}
-    
-    prompt_string = "\n".join(prompt)
-    return prompt_string, elements_dict
+
+    # Highlight indices are dense, so records are placed by index instead of sorted
+    slots = [None] * (max(record.highlight_index for record in records) + 1)
+    overflow = []
+    for record in records:
+        if slots[record.highlight_index] is None:
+            slots[record.highlight_index] = record
+        else:
+            overflow.append(record)
+    ordered = [record for record in slots if record is not None]
+    if overflow:
+        ordered = sorted(ordered + overflow, key=lambda record: record.highlight_index)
+
+    if element_prompt is not None:
+        elements_dict = {str(record.highlight_index): record.to_dict() for record in ordered}
+        return element_prompt.render(ordered), elements_dict
+
+    labels = []
+    elements_dict = {}
+    for record in ordered:
+        labels.append(record.label())
+        elements_dict[str(record.highlight_index)] = record.to_dict()
+    return "\n".join(labels), elements_dict
 
 
 def _extract_text_content(element_data, elements_map):
@@ -72,7 +192,7 @@ def _extract_text_content(element_data, elements_map):
     # Direct text content
     if 'text' in element_data:
         return element_data['text'].strip()
-    
+
     # Check for text in children
     if 'children' in element_data:
         text_parts = []
@@ -83,12 +203,11 @@ def _extract_text_content(element_data, elements_map):
                     text_parts.append(child['text'].strip())
         if text_parts:
             return " ".join(text_parts)
-    
+
     # Fallback to common attributes
     attributes = element_data.get('attributes', {})
     for attr in ['aria-label', 'title', 'alt', 'placeholder', 'value']:
         if attr in attributes and attributes[attr]:
             return attributes[attr].strip()
-    
-    return ""
 
+    return ""
@@ -0,0 +1,239 @@
+import base64
+import hashlib
+import math
+import struct
+import zlib
+from collections import OrderedDict
+from typing import Any, Optional
+
+# Approximate pixels per image token of current multimodal models
+PIXELS_PER_TOKEN = 750
+# Width of the thumbnail used to detect unchanged frames
+THUMBNAIL_WIDTH = 160
+# Grid of the difference hash, one bit per horizontally adjacent pixel pair
+HASH_SIZE = 8
+# Frames whose perceptual hash is remembered for image_key
+FRAME_HASHES = 32
+
+MIME_TYPES = {"png": "image/png", "jpeg": "image/jpeg", "webp": "image/webp"}
+
+DEFAULT_SCREENSHOT_CONFIG = {
+    "format": "png",
+    "quality": None,
+    "clip": None,
+    "token_budget": None,
+    "reuse_threshold": None,
+    "perceptual_hash": False,
+}
+
+
+class ScreenshotPipeline:
+    """
+    Captures screenshots through CDP Page.captureScreenshot.
+
+    Config:
+        format: "png", "jpeg" or "webp"
+        quality: Compression quality (0-100) for jpeg and webp
+        clip: Optional {x, y, width, height} region in CSS pixels, relative to the
+            viewport; defaults to the whole viewport
+        token_budget: If set, the image is downscaled by the browser until it fits
+            in about this many image tokens
+        reuse_threshold: If set, a low-resolution thumbnail is captured first and
+            the previous frame is returned instead of capturing and encoding a new
+            one when the thumbnail is byte-identical (0) or its perceptual hash is
+            within this many bits of the previous one (> 0)
+        perceptual_hash: Hash the thumbnail of every frame, so image_key can
+            identify near-identical frames (e.g. for LLM cache keys)
+    """
+
+    def __init__(self, driver, config: Optional[dict] = None):
+        self.driver = driver
+        self.config = {**DEFAULT_SCREENSHOT_CONFIG, **(config or {})}
+        if self.config["format"] not in MIME_TYPES:
+            raise ValueError(f"Unsupported screenshot format: {self.config['format']}")
+        self.mime_type = MIME_TYPES[self.config["format"]]
+
+        self._last_data = None
+        self._last_thumbnail = None
+        self._last_hash = None
+        self.reused = 0
+        # sha256 of returned data -> perceptual hash of its thumbnail
+        self.frame_hashes = OrderedDict()
+
+    def capture(self) -> str:
+        """Returns the base64 encoded screenshot."""
+        region = None
+        if self.config["clip"] is not None or self.config["token_budget"] is not None:
+            region = self._region()
+
+        threshold = self.config["reuse_threshold"]
+        thumbnail = frame_hash = None
+        if threshold is not None or self.config["perceptual_hash"]:
+            thumbnail = self._thumbnail(region)
+            if threshold or self.config["perceptual_hash"]:
+                frame_hash = difference_hash(thumbnail)
+
+        if threshold is not None and self._unchanged(thumbnail, frame_hash):
+            self.reused += 1
+            return self._last_data
+
+        params = {"format": self.config["format"], "optimizeForSpeed": True}
+        if self.config["quality"] is not None and self.config["format"] != "png":
+            params["quality"] = self.config["quality"]
+        if region is not None:
+            params["clip"] = {**region, "scale": self._scale(region)}
+
+        self._last_data = self.driver.execute_cdp_cmd("Page.captureScreenshot", params)["data"]
+        if frame_hash is not None:
+            self.frame_hashes[_digest(self._last_data)] = frame_hash
+            while len(self.frame_hashes) > FRAME_HASHES:
+                self.frame_hashes.popitem(last=False)
+        return self._last_data
+
+    def image_key(self, data: str) -> Optional[str]:
+        """The perceptual hash of a frame returned by capture, if it was hashed."""
+        frame_hash = self.frame_hashes.get(_digest(data))
+        return None if frame_hash is None else f"dhash:{frame_hash:016x}"
+
+    def reset(self) -> None:
+        """Forgets the previous frame, so the next capture is never reused."""
+        self._last_data = None
+        self._last_thumbnail = None
+        self._last_hash = None
+
+    def _region(self) -> dict[str, Any]:
+        """The captured region in document coordinates, plus the device pixel ratio."""
+        metrics = self.driver.execute_cdp_cmd("Page.getLayoutMetrics", {})
+        viewport = metrics.get("cssVisualViewport") or metrics["visualViewport"]
+        device_viewport = metrics.get("visualViewport", viewport)
+        self._device_pixel_ratio = device_viewport["clientWidth"] / viewport["clientWidth"] if viewport["clientWidth"] else 1
+
+        clip = self.config["clip"] or {"x": 0, "y": 0, "width": viewport["clientWidth"], "height": viewport["clientHeight"]}
+        return {
+            "x": viewport["pageX"] + clip["x"],
+            "y": viewport["pageY"] + clip["y"],
+            "width": clip["width"],
+            "height": clip["height"],
+        }
+
+    def _scale(self, region: dict[str, Any]) -> float:
+        """Scale of the clip so the output fits the token budget."""
+        if self.config["token_budget"] is None:
+            return 1
+        pixels = region["width"] * region["height"] * self._device_pixel_ratio ** 2
+        budget = self.config["token_budget"] * PIXELS_PER_TOKEN
+        return min(1, math.sqrt(budget / pixels)) if pixels else 1
+
+    def _thumbnail(self, region: Optional[dict[str, Any]]) -> bytes:
+        """A THUMBNAIL_WIDTH wide PNG of the captured region."""
+        if region is None:
+            region = self._region()
+        scale = THUMBNAIL_WIDTH / (region["width"] * self._device_pixel_ratio) if region["width"] else 1
+        return base64.b64decode(self.driver.execute_cdp_cmd("Page.captureScreenshot", {
+            "format": "png",
+            "clip": {**region, "scale": min(1, scale)},
+            "optimizeForSpeed": True,
+        })["data"])
+
+    def _unchanged(self, thumbnail: bytes, frame_hash: Optional[int]) -> bool:
+        """Compares a thumbnail with the previous one."""
+        threshold = self.config["reuse_threshold"]
+        previous_thumbnail, previous_hash = self._last_thumbnail, self._last_hash
+        self._last_thumbnail = thumbnail
+        self._last_hash = frame_hash
+
+        if self._last_data is None or previous_thumbnail is None:
+            return False
+        if thumbnail == previous_thumbnail:
+            return True
+        if threshold > 0 and previous_hash is not None and frame_hash is not None:
+            return bin(frame_hash ^ previous_hash).count("1") <= threshold
+        return False
+
+
+def _digest(data: str) -> str:
+    return hashlib.sha256(data.encode("ascii")).hexdigest()
+
+
+def difference_hash(png: bytes, size: int = HASH_SIZE) -> int:
+    """
+    64-bit difference hash of a PNG image.
+
+    The image is reduced to a (size + 1) x size grayscale grid and each bit
+    records whether a cell is brighter than its right neighbour, so small
+    rendering noise leaves the hash unchanged.
+    """
+    width, height, gray = _decode_png_gray(png)
+    grid = []
+    for row in range(size):
+        y0, y1 = row * height // size, max((row + 1) * height // size, row * height // size + 1)
+        cells = []
+        for column in range(size + 1):
+            x0, x1 = column * width // (size + 1), max((column + 1) * width // (size + 1), column * width // (size + 1) + 1)
+            total = sum(sum(gray[y][x0:x1]) for y in range(y0, y1))
+            cells.append(total / ((y1 - y0) * (x1 - x0)))
+        grid.append(cells)
+
+    value = 0
+    for cells in grid:
+        for column in range(size):
+            value = (value << 1) | (cells[column] > cells[column + 1])
+    return value
+
+
+def _decode_png_gray(png: bytes) -> tuple[int, int, list[list[int]]]:
+    """Decodes an 8-bit grayscale, RGB or RGBA PNG (as Chrome emits) into gray rows."""
+    if png[:8] != b"\x89PNG\r\n\x1a\n":
+        raise ValueError("Not a PNG image")
+
+    position = 8
+    idat = []
+    width = height = channels = None
+    while position < len(png):
+        length, kind = struct.unpack(">I4s", png[position:position + 8])
+        chunk = png[position + 8:position + 8 + length]
+        position += 12 + length
+        if kind == b"IHDR":
+            width, height, depth, color_type = struct.unpack(">IIBB", chunk[:10])
+            channels = {0: 1, 2: 3, 4: 2, 6: 4}.get(color_type)
+            if depth != 8 or channels is None:
+                raise ValueError(f"Unsupported PNG: bit depth {depth}, color type {color_type}")
+        elif kind == b"IDAT":
+            idat.append(chunk)
+        elif kind == b"IEND":
+            break
+
+    raw = zlib.decompress(b"".join(idat))
+    stride = width * channels
+    previous = bytearray(stride)
+    rows = []
+    for y in range(height):
+        start = y * (stride + 1)
+        filter_type = raw[start]
+        row = bytearray(raw[start + 1:start + 1 + stride])
+        if filter_type == 1:
+            for i in range(channels, stride):
+                row[i] = (row[i] + row[i - channels]) & 0xFF
+        elif filter_type == 2:
+            for i in range(stride):
+                row[i] = (row[i] + previous[i]) & 0xFF
+        elif filter_type == 3:
+            for i in range(stride):
+                left = row[i - channels] if i >= channels else 0
+                row[i] = (row[i] + ((left + previous[i]) >> 1)) & 0xFF
+        elif filter_type == 4:
+            for i in range(stride):
+                a = row[i - channels] if i >= channels else 0
+                b = previous[i]
+                c = previous[i - channels] if i >= channels else 0
+                p = a + b - c
+                pa, pb, pc = abs(p - a), abs(p - b), abs(p - c)
+                predictor = a if pa <= pb and pa <= pc else (b if pb <= pc else c)
+                row[i] = (row[i] + predictor) & 0xFF
+        previous = row
+
+        if channels >= 3:
+            rows.append([(row[i] * 299 + row[i + 1] * 587 + row[i + 2] * 114) // 1000 for i in range(0, stride, channels)])
+        else:
+            rows.append(list(row[::channels]))
+    return width, height, rows
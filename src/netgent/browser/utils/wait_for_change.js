@@ -0,0 +1,60 @@
+window.armChangeWatcher = () => {
+  let watcher = window.__netgentChangeWatcher;
+  if (!watcher) {
+    watcher = { changes: 0, lastChange: Date.now(), url: window.location.href };
+    const observer = new MutationObserver(() => {
+      watcher.changes++;
+      watcher.lastChange = Date.now();
+    });
+    // Attribute churn from media players and animations is ignored, except for
+    // the attributes commonly used to show and hide content
+    observer.observe(document, {
+      subtree: true,
+      childList: true,
+      characterData: true,
+      attributes: true,
+      attributeFilter: ["class", "hidden", "aria-hidden", "open"],
+    });
+    window.__netgentChangeWatcher = watcher;
+  }
+  watcher.changes = 0;
+  watcher.url = window.location.href;
+  return true;
+};
+
+window.waitForChange = (timeoutMs, settleMs) =>
+  new Promise((resolve) => {
+    // A missing watcher means the document was replaced since it was armed.
+    // Otherwise the watcher is read as armed, so mutations and URL changes made
+    // since then (e.g. by the previous state's actions) wake this wait; it is
+    // only re-armed once the wait resolves.
+    const navigated = !window.__netgentChangeWatcher;
+    if (navigated) window.armChangeWatcher();
+    const watcher = window.__netgentChangeWatcher;
+    const start = Date.now();
+    if (navigated) watcher.lastChange = start;
+
+    function poll() {
+      const now = Date.now();
+      if (watcher.url !== window.location.href) {
+        watcher.changes++;
+        watcher.lastChange = now;
+        watcher.url = window.location.href;
+      }
+
+      const changed = navigated || watcher.changes > 0;
+      const settled =
+        now - watcher.lastChange >= settleMs &&
+        document.readyState === "complete";
+      if (changed && settled) {
+        window.armChangeWatcher();
+        resolve("changed");
+      } else if (now - start >= timeoutMs) {
+        window.armChangeWatcher();
+        resolve("timeout");
+      } else {
+        setTimeout(poll, 50);
+      }
+    }
+    poll();
+  });
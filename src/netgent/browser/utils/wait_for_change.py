@@ -0,0 +1,51 @@
+import time
+import logging
+from .page_scripts import SCRIPTS, call_page_function
+
+logger = logging.getLogger(__name__)
+
+WAIT_FOR_CHANGE_SCRIPT = SCRIPTS['wait_for_change.js']
+
+
+def arm_change_watcher(driver) -> None:
+    """
+    Installs the in-page MutationObserver (if needed) and resets its change counter.
+
+    Changes made after this call, including navigations that replace the document,
+    wake the next wait_for_change call.
+    """
+    call_page_function(driver, "armChangeWatcher")
+
+
+def wait_for_change(driver, timeout: float, settle: float = 0.3) -> bool:
+    """
+    Blocks until the page changes and settles, or until the timeout expires.
+
+    The page counts as changed when the DOM mutates, the URL changes or the document
+    is replaced by a navigation. It counts as settled once the document has finished
+    loading and no mutation has been observed for `settle` seconds.
+
+    Args:
+        driver: The Selenium WebDriver instance
+        timeout: Upper bound on the wait, in seconds
+        settle: Quiet period required after the last change, in seconds
+
+    Returns:
+        True if a change was observed, False if the timeout expired first.
+    """
+    deadline = time.time() + timeout
+    while True:
+        remaining = deadline - time.time()
+        if remaining <= 0:
+            return False
+        try:
+            result = call_page_function(
+                driver, "waitForChange", int(remaining * 1000), int(settle * 1000), await_promise=True
+            )
+        except Exception as e:
+            # The execution context is destroyed when the page navigates mid-wait;
+            # the next evaluation runs in the new document and sees the navigation
+            logger.debug(f"Change wait interrupted: {e}")
+            time.sleep(0.05)
+            continue
+        return result.get("result", {}).get("value") == "changed"
@@ -9,9 +9,13 @@ This component:
 - Determines which states should execute
 - Enforces single vs. multiple state execution policies
 - Routes workflow to appropriate next step
+- Skips states whose URL trigger cannot match the current page
+- Validates newly generated checks against the page they were defined on
 
 Classes:
     ProgramController: Main controller class for state checking
+    StateIndex: Index of a state repository by URL trigger and shared checks
+    TriggerCostModel: Learned cost estimates used to run cheap checks first
 
 Usage:
     from netgent.components.program_controller import ProgramController
@@ -22,10 +26,17 @@ Usage:
 Configuration:
     config = {
         "allow_multiple_states": False,  # Allow multiple states to match
+        "batch_triggers": False,  # Evaluate element/text/url checks in one in-page call
+        "transition_period": 3,  # Upper bound on the wait before checking (seconds)
+        "settle_period": 0.3,  # Quiet period after a page change (wait_and_check only)
+        "order_checks": True,  # Run each state's cheapest checks first
+        "slow_trigger_ms": 50.0,  # Text checks slower than this may be replaced by validate_checks
     }
 """
 
 from .controller import ProgramController
+from .index import StateIndex
+from .cost import TriggerCostModel
 
-__all__ = ["ProgramController"]
+__all__ = ["ProgramController", "StateIndex", "TriggerCostModel"]
 
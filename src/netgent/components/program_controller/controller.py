@@ -2,53 +2,256 @@ from __future__ import annotations
 from typing import Optional
 from netgent.browser.controller.base import BaseController
 from netgent.browser.registry import TriggerRegistry
+from netgent.browser.utils import compile_check, check_triggers, inspect_triggers, arm_change_watcher, wait_for_change
+from .index import StateIndex, check_key
+from .cost import TriggerCostModel
 import time
+import re
+
+# Generated ids and labels (long digit runs) change between page loads,
+# like the ids state_synthesis.candidates scores down
+_UNSTABLE_SELECTOR = re.compile(r"\d{3,}")
 
 class ProgramController:
     def __init__(self, controller: BaseController, config: Optional[dict] = None):
         self.controller = controller
         self.trigger_registry = TriggerRegistry(controller)
-        
+
         default_config = {
             "allow_multiple_states": False,
+            "batch_triggers": False,
+            "transition_period": 3,
+            "settle_period": 0.3,
+            "order_checks": True,
+            "slow_trigger_ms": 50.0,
         }
         self.config = {**default_config, **(config or {})}
+        self._builtin_triggers = self._find_builtin_triggers()
+        self.index = StateIndex()
+        self.cost_model = TriggerCostModel()
+
+    def _find_builtin_triggers(self) -> set[str]:
+        """Trigger types still backed by BaseController (overridden triggers are checked one by one)."""
+        batchable = set()
+        base_triggers = getattr(BaseController, "__triggers__", {})
+        for trigger_name in ("element", "text", "url"):
+            attr_name = base_triggers.get(trigger_name)
+            method = self.trigger_registry.triggers.get(trigger_name)
+            if attr_name and getattr(method, "__func__", None) is getattr(BaseController, attr_name):
+                batchable.add(trigger_name)
+        return batchable
+
+    def add_state(self, state: dict) -> None:
+        """Index a state appended to the repository (e.g. one generated by the web agent)."""
+        self.index.add(state)
+
+    def validate_checks(self, checks: list[dict]) -> tuple[list[dict], list[dict]]:
+        """
+        Validates newly defined checks against the page they were defined on.
+
+        Checks that match nothing, or whose element is hidden although visibility
+        is checked, are dropped. Text checks slower than `slow_trigger_ms` get
+        an element check added when the element has a unique id or
+        attribute selector free of generated-looking values; the text check is
+        kept, so the text condition still holds. Checks matching
+        several elements, or slow ones without such a selector, are kept and
+        reported. If no page check survives, the
+        original checks are returned unchanged.
+
+        Returns:
+            (validated checks, one report entry per original check)
+        """
+        specs = [compile_check(check) for check in checks]
+        inspectable = [spec for spec in specs if spec is not None]
+        try:
+            results = iter(inspect_triggers(self.controller.driver, inspectable))
+        except Exception as e:
+            print(f"Trigger validation skipped: {e}")
+            return checks, []
+
+        validated, report = [], []
+        slow_ms = self.config["slow_trigger_ms"]
+        for check, spec in zip(checks, specs):
+            info = next(results) if spec is not None else None
+            if info is None or check.get("type") == "url":
+                validated.append(check)
+                report.append({"check": check, "status": "kept"})
+                continue
+
+            entry = {"check": check, "matches": info["matches"], "ms": info["ms"]}
+            if info["matches"] == 0 or (spec.get("checkVisibility") and not info["visible"]):
+                entry["status"] = "dropped_not_found" if info["matches"] == 0 else "dropped_hidden"
+            elif check.get("type") == "text" and info["ms"] > slow_ms and info["matches"] == 1 and _is_stable_selector(info.get("cssSelector")):
+                params = {"by": "css selector", "selector": info["cssSelector"]}
+                if "check_visibility" in check.get("params", {}):
+                    params["check_visibility"] = check["params"]["check_visibility"]
+                selector_check = {"type": "element", "params": params}
+                # The cost model runs the cheaper element check first, so pages without it skip the text search
+                validated.extend([selector_check, check])
+                entry.update(status="added_selector", selector_check=selector_check)
+            else:
+                validated.append(check)
+                entry["status"] = "ambiguous" if info["matches"] > 1 else ("slow" if info["ms"] > slow_ms else "ok")
+            report.append(entry)
+            print(f"Trigger validation: {entry['status']} on {check.get('type')} and {check.get('params')}")
+
+        had_page_checks = any(check.get("type") != "url" for check in checks)
+        if had_page_checks and not any(check.get("type") != "url" for check in validated):
+            return checks, report
+        return validated, report
+
+    def conflicting_states(self, state: dict) -> list[str]:
+        """
+        Names of indexed states that would match together with `state`: states
+        whose checks are a subset or a superset of its checks.
+        """
+        keys = {check_key(check) for check in state.get("checks", [])}
+        conflicts = []
+        for other in self.index.states:
+            if other is state:
+                continue
+            other_keys = {check_key(check) for check in other.get("checks", [])}
+            if other_keys <= keys or keys <= other_keys:
+                conflicts.append(other.get("name"))
+        return conflicts
 
     def check(self, states: list[dict]) -> list[dict]:
         start_time = time.time()
-        matching_states = []
-        for state in states:
-            start_time = time.time()
-            if self._check_state(state):
-                matching_states.append(state)
-            end_time = time.time()
-            print(f"State checking took {end_time - start_time:.4f} seconds")
+        candidates = self._candidate_states(states)
+        if self.config["batch_triggers"]:
+            matching_states = self._check_batched(candidates)
+        else:
+            matching_states = []
+            results = {}
+            for state in candidates:
+                state_start_time = time.time()
+                if self._check_state(state, results):
+                    matching_states.append(state)
+                print(f"State checking took {time.time() - state_start_time:.4f} seconds")
         end_time = time.time()
         print(f"State checking took {end_time - start_time:.4f} seconds")
-        
+
         if not self.config["allow_multiple_states"] and len(matching_states) > 1:
             raise ValueError(f"Multiple states matched: {len(matching_states)} states found: {matching_states}")
-        
+
+        return matching_states
+
+    def wait_and_check(self, states: list[dict]) -> list[dict]:
+        """
+        Event-driven alternative to sleeping transition_period before check.
+
+        Re-checks the states each time the page changes and settles, returning as soon
+        as one matches. transition_period bounds the total wait, so "no state matched"
+        is only reported after the same delay as the fixed sleep.
+        """
+        deadline = time.time() + self.config["transition_period"]
+        driver = self.controller.driver
+        while True:
+            changed = wait_for_change(driver, max(0.0, deadline - time.time()), self.config["settle_period"])
+            matching_states = self.check(states)
+            if matching_states or not changed or time.time() >= deadline:
+                break
+
+        try:
+            # Changes made by the next state's actions wake the following wait
+            arm_change_watcher(driver)
+        except Exception as e:
+            print(f"Could not arm change watcher: {e}")
         return matching_states
 
-    def _check_state(self, state: dict) -> bool:
-        checks = state.get("checks", [])
-        
+    def _candidate_states(self, states: list[dict]) -> list[dict]:
+        """Narrow the repository to the states that can match the current URL."""
+        self.index.sync(states)
+        if "url" not in self._builtin_triggers or not self.index.has_url_keys:
+            return states
+
+        try:
+            current_url = self.controller.driver.current_url
+        except Exception as e:
+            print(f"Could not read current URL, checking all states: {e}")
+            return states
+
+        candidates = self.index.candidates(current_url)
+        print(f"Checking {len(candidates)} of {len(states)} states for {current_url}")
+        return candidates
+
+    def _check_batched(self, states: list[dict]) -> list[dict]:
+        """Evaluate every batchable check in one round trip, then reduce the results per state."""
+        specs = []
+        spec_indices = {}
+        plans = []
+        for state in states:
+            plan = []
+            for check in state.get("checks", []):
+                spec = compile_check(check) if check.get("type") in self._builtin_triggers else None
+                if spec is None:
+                    plan.append((None, check))
+                    continue
+                # Identical checks shared across states are evaluated once
+                key = repr(sorted(spec.items()))
+                if key not in spec_indices:
+                    spec_indices[key] = len(specs)
+                    specs.append(spec)
+                plan.append((spec_indices[key], check))
+            plans.append(plan)
+
+        try:
+            results = check_triggers(self.controller.driver, specs)
+        except Exception as e:
+            print(f"Batched trigger check failed, checking states one by one: {e}")
+            return [state for state in states if self._check_state(state)]
+        print(f"Batched {len(specs)} checks across {len(states)} states")
+
+        matching_states = []
+        for state, plan in zip(states, plans):
+            if not all(results[index] for index, _ in plan if index is not None):
+                continue
+            # Remaining checks only run for states whose batched checks all passed
+            remaining = self._order_checks([check for index, check in plan if index is None])
+            if all(self._check_trigger(check) for check in remaining):
+                matching_states.append(state)
+        return matching_states
+
+    def _order_checks(self, checks: list[dict]) -> list[dict]:
+        """Cheapest checks first, so a failing cheap check short-circuits expensive ones."""
+        if not self.config["order_checks"]:
+            return checks
+        return self.cost_model.order(checks)
+
+    def _check_state(self, state: dict, results: Optional[dict] = None) -> bool:
+        checks = self._order_checks(state.get("checks", []))
+
         for check in checks:
-            trigger_type = check.get("type")
-            params = check.get("params", {})
-            
-            if not trigger_type:
-                return False
-            
-            try:
-                result = self.trigger_registry.check(trigger_type, params)
-                print(f"Result: {result} on {trigger_type} and {params}")
-                if not result:
-                    return False
-            except (KeyError, TypeError) as e:
-                print(f"Error checking trigger '{trigger_type}': {e}")
+            if not self._check_trigger(check, results):
                 return False
-                
+
         return True
 
+    def _check_trigger(self, check: dict, results: Optional[dict] = None) -> bool:
+        trigger_type = check.get("type")
+        params = check.get("params", {})
+
+        if not trigger_type:
+            return False
+
+        # Checks shared by several states are evaluated once per pass
+        key = check_key(check) if results is not None else None
+        if key is not None and key in results:
+            return results[key]
+
+        try:
+            check_start_time = time.time()
+            result = bool(self.trigger_registry.check(trigger_type, params))
+            self.cost_model.observe(check, time.time() - check_start_time)
+            print(f"Result: {result} on {trigger_type} and {params}")
+        except (KeyError, TypeError) as e:
+            print(f"Error checking trigger '{trigger_type}': {e}")
+            result = False
+
+        if key is not None and self.index.is_shared(key):
+            results[key] = result
+        return result
+
+
+def _is_stable_selector(selector) -> bool:
+    return bool(selector) and ":nth-" not in selector and not _UNSTABLE_SELECTOR.search(selector)
@@ -0,0 +1,68 @@
+from __future__ import annotations
+from netgent.browser.utils.check_triggers import MAX_PROBE_TIMEOUT
+
+# Prior cost estimates in seconds, refined by observed latencies
+DEFAULT_COSTS = {
+    "url": 0.001,  # A single current_url read
+    "element": 0.01,  # Selector lookup
+    "element_visible": 0.02,  # Selector lookup plus a visibility script
+    "element_xpath": 0.03,
+    "element_xpath_visible": 0.04,
+    "text": 0.05,  # Full-document XPath text search
+    "text_visible": 0.06,
+}
+# Custom triggers have unknown cost until observed
+UNKNOWN_COST = 0.05
+
+
+class TriggerCostModel:
+    """
+    Estimates the cost of evaluating a check so cheap checks run first.
+
+    Checks are grouped into cost classes by trigger type, locator strategy,
+    visibility and whether they explicitly wait for the page. Each class
+    starts from a prior and tracks an exponentially weighted moving average
+    of observed latencies.
+    """
+
+    def __init__(self, smoothing: float = 0.2):
+        self.smoothing = smoothing
+        self.costs: dict[str, float] = dict(DEFAULT_COSTS)
+
+    @staticmethod
+    def _timeout(check: dict) -> float:
+        timeout = (check.get("params", {}) or {}).get("timeout")
+        return timeout if isinstance(timeout, (int, float)) else 0.0
+
+    @classmethod
+    def cost_class(cls, check: dict) -> str:
+        trigger_type = check.get("type") or ""
+        params = check.get("params", {}) or {}
+        # Checks waiting longer than a probe (and left out of batches) get their own class
+        wait = "_wait" if cls._timeout(check) > MAX_PROBE_TIMEOUT else ""
+        visible = "_visible" if params.get("check_visibility", True) else ""
+        if trigger_type == "element":
+            xpath = "_xpath" if params.get("by") == "xpath" else ""
+            return f"element{xpath}{visible}{wait}"
+        if trigger_type == "text":
+            return f"text{visible}{wait}"
+        return f"{trigger_type}{wait}"
+
+    def estimate(self, check: dict) -> float:
+        cost = self.costs.get(self.cost_class(check))
+        if cost is None:
+            # Until observed, a miss on a waiting check is assumed to cost its full timeout
+            cost = max(UNKNOWN_COST, self._timeout(check))
+        return cost
+
+    def observe(self, check: dict, seconds: float) -> None:
+        key = self.cost_class(check)
+        previous = self.costs.get(key)
+        if previous is None:
+            self.costs[key] = seconds
+        else:
+            self.costs[key] = previous + self.smoothing * (seconds - previous)
+
+    def order(self, checks: list[dict]) -> list[dict]:
+        """Checks sorted cheapest first (stable, so equal costs keep their order)."""
+        return sorted(checks, key=self.estimate)
@@ -0,0 +1,74 @@
+from __future__ import annotations
+import json
+
+
+def check_key(check: dict) -> tuple[str, str]:
+    """Hashable identity of a check, shared by identical checks across states."""
+    return check.get("type") or "", json.dumps(check.get("params", {}) or {}, sort_keys=True, default=str)
+
+
+class StateIndex:
+    """
+    Index over a state repository keyed by URL trigger and by check.
+
+    A `url` trigger only passes on an exact match of the current URL, so a state
+    with a url check can only match on that URL. States are bucketed by the URL
+    they require; states without a url check are candidates on every page.
+    The index is kept in sync with the repository incrementally: appended states
+    are indexed as they come, any other change rebuilds it.
+    """
+
+    def __init__(self, states: list[dict] | None = None):
+        self.rebuild(states or [])
+
+    def rebuild(self, states: list[dict]) -> None:
+        """Re-index a repository from scratch."""
+        self.states: list[dict] = []
+        self.by_url: dict[str, list[int]] = {}
+        self.by_check: dict[tuple[str, str], list[int]] = {}
+        self.unkeyed: list[int] = []
+        for state in states:
+            self.add(state)
+
+    def add(self, state: dict) -> None:
+        """Index a state appended to the end of the repository."""
+        position = len(self.states)
+        self.states.append(state)
+
+        urls = set()
+        keys = set()
+        for check in state.get("checks", []):
+            keys.add(check_key(check))
+            params = check.get("params", {}) or {}
+            if check.get("type") == "url" and isinstance(params.get("url"), str):
+                urls.add(params["url"])
+        for key in keys:
+            self.by_check.setdefault(key, []).append(position)
+
+        if not urls:
+            self.unkeyed.append(position)
+        elif len(urls) == 1:
+            self.by_url.setdefault(urls.pop(), []).append(position)
+        # A state requiring two different URLs can never match and is not bucketed
+
+    def sync(self, states: list[dict]) -> None:
+        """Bring the index up to date with the repository passed to the controller."""
+        indexed = len(self.states)
+        if len(states) >= indexed and all(a is b for a, b in zip(self.states, states)):
+            for state in states[indexed:]:
+                self.add(state)
+            return
+        self.rebuild(states)
+
+    @property
+    def has_url_keys(self) -> bool:
+        return bool(self.by_url)
+
+    def candidates(self, url: str | None) -> list[dict]:
+        """States that can match on the given URL, in repository order."""
+        positions = sorted(self.by_url.get(url, []) + self.unkeyed)
+        return [self.states[position] for position in positions]
+
+    def is_shared(self, key: tuple[str, str]) -> bool:
+        """Whether a check appears in more than one state."""
+        return len(self.by_check.get(key, ())) > 1
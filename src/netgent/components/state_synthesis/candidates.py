@@ -0,0 +1,119 @@
+import re
+from typing import Any, Optional
+
+# Rough characters per token of the candidate lines in the prompt
+CHARS_PER_TOKEN = 4
+DEFAULT_MAX_CANDIDATES = 60
+DEFAULT_TOKEN_BUDGET = 2000
+# Shortest text that earns the bonus for appearing verbatim in a description
+MIN_PHRASE_LENGTH = 3
+
+_WORD = re.compile(r"[a-z0-9]+")
+_STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "has", "if", "in", "is",
+    "it", "of", "on", "or", "page", "the", "there", "this", "to", "visible", "when", "with",
+}
+
+
+def _words(text: str) -> set[str]:
+    return {word for word in _WORD.findall(text.lower()) if word not in _STOPWORDS and len(word) > 1}
+
+
+def _text_stability(text: str) -> float:
+    """Short, static labels survive reloads; counters, timestamps and long copy do not."""
+    score = 1.0 if len(text) <= 40 else -0.5 * (len(text) // 40)
+    if text.endswith("..."):
+        score -= 1.0
+    if re.search(r"\d", text):
+        score -= 0.5
+    return score
+
+
+def _selector_stability(selector: str) -> float:
+    """ID and attribute selectors are stable; positional ones break on layout changes."""
+    score = 0.0
+    if re.search(r"#[A-Za-z_-][\w-]*", selector) and not re.search(r"#[\w-]*\d{3,}", selector):
+        score += 2.0
+    if re.search(r"\[(aria-label|data-testid|data-test|data-cy|name|role)=", selector):
+        score += 1.5
+    score -= selector.count(":nth-") * 1.0
+    score -= len(selector) / 100
+    return score
+
+
+def _position(trigger: dict[str, Any], viewport_height: float) -> float:
+    """Elements near the top of the viewport describe the page best."""
+    top = trigger.get("viewport", {}).get("top")
+    if top is None or viewport_height <= 0:
+        return 0.0
+    if top < 0 or top > viewport_height:
+        return -0.5
+    return 0.5 * (1 - top / viewport_height)
+
+
+def _relevance(text: str, description_words: set[str], description: str) -> float:
+    """Share of the text's words in the descriptions, plus a bonus when the whole text appears on word boundaries."""
+    if not text or not description_words:
+        return 0.0
+    words = _words(text)
+    overlap = len(words & description_words) / len(words) if words else 0.0
+    phrase = " ".join(_WORD.findall(text.lower()))
+    quoted = len(phrase) >= MIN_PHRASE_LENGTH and f" {phrase} " in description
+    return 2.0 * overlap + (2.0 if quoted else 0.0)
+
+
+def rank_trigger_candidates(
+    page_triggers: list[dict[str, Any]],
+    descriptions: list[str],
+    viewport_height: Optional[float] = None,
+    max_candidates: Optional[int] = DEFAULT_MAX_CANDIDATES,
+    token_budget: Optional[int] = DEFAULT_TOKEN_BUDGET,
+) -> dict[str, dict]:
+    """
+    Turns find_trigger elements into the TEXT_i / CSS_i trigger candidates,
+    keeping only the most useful ones.
+
+    Identical texts and selectors are merged. Candidates are scored by how
+    stable they are likely to be, how well they match the wording of the
+    state's trigger descriptions and how high they sit in the viewport, then
+    kept best first until `max_candidates` or `token_budget` is reached.
+    Without a `viewport_height` (the page's innerHeight), position is not scored.
+    Keys keep the index of the element in `page_triggers`.
+    """
+    # Words separated by single spaces and padded, so phrases match on word boundaries
+    description = f" {' '.join(_WORD.findall(' '.join(descriptions).lower()))} "
+    description_words = _words(description)
+    if viewport_height is None:
+        viewport_height = 0
+
+    scored = []
+    seen_texts, seen_selectors = set(), set()
+    for i, trigger in enumerate(page_triggers):
+        position = _position(trigger, viewport_height)
+        text = trigger.get("text", "")
+        label = trigger.get("accessibleName") or text
+        if text != "" and text not in seen_texts:
+            seen_texts.add(text)
+            score = _text_stability(text) + _relevance(text, description_words, description) + position
+            scored.append((score, i, f"TEXT_{i}", {"type": "text", "params": {"text": text}}))
+        selector = trigger.get("enhancedCssSelector", "")
+        if selector != "" and selector not in seen_selectors:
+            seen_selectors.add(selector)
+            score = _selector_stability(selector) + _relevance(label, description_words, description) + position
+            scored.append((score, i, f"CSS_{i}", {"type": "element", "params": {"by": "css selector", "selector": selector}}))
+
+    scored.sort(key=lambda candidate: (-candidate[0], candidate[1]))
+
+    candidates = {}
+    tokens = 0
+    for _, _, key, candidate in scored:
+        if max_candidates is not None and len(candidates) >= max_candidates:
+            break
+        # Matches the "KEY <type/>: k=v" line the candidate takes in the prompt
+        line = len(key) + len(candidate["type"]) + sum(len(k) + len(str(v)) + 3 for k, v in candidate["params"].items()) + 6
+        cost = line / CHARS_PER_TOKEN
+        if token_budget is not None and candidates and tokens + cost > token_budget:
+            break
+        candidates[key] = candidate
+        tokens += cost
+    return candidates
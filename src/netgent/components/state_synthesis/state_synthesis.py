@@ -9,7 +9,10 @@ from netgent.browser.utils import find_trigger
 from netgent.browser.registry import TriggerRegistry
 from netgent.utils.message import StatePrompt
 from .prompt import get_prompt
+from .candidates import rank_trigger_candidates
+from concurrent.futures import Future, ThreadPoolExecutor
 import re
+from urllib.parse import urlsplit
 load_dotenv()
 
 class StateSynthesisState(TypedDict):
@@ -18,18 +21,72 @@ class StateSynthesisState(TypedDict):
     choice: StatePrompt | None # State Choice
     triggers: list[str] # Triggers
     prompt: Optional[str] # Generated prompt for browser agent
+    speculated: Optional[str] # State whose triggers and prompt were generated speculatively
+
+class LLMTriggerOutput(BaseModel):
+    triggers: List[str]
+
+_URL_TOKEN = re.compile(r"(?:https?://)?(?:[\w-]+\.)+[a-z]{2,}(?:/[^\s'\"),]*)?", re.IGNORECASE)
+_QUOTED_PHRASE = re.compile(r"[\"“']([^\"”']{3,})[\"”']")
+
+def _split_url(url: str) -> tuple[str, str]:
+    """(host without www., path without trailing slash) of a URL, ignoring the query and fragment."""
+    url = (url or "").strip().lower()
+    if not re.match(r"^[a-z][a-z0-9+.-]*://", url):
+        url = "http://" + url
+    parts = urlsplit(url)
+    host = parts.hostname or ""
+    return (host[4:] if host.startswith("www.") else host), parts.path.rstrip("/")
+
+def _url_patterns(text: str) -> list[tuple[str, str]]:
+    """URLs and domains mentioned in trigger descriptions, split like the current URL."""
+    patterns = (_split_url(token.rstrip(".")) for token in _URL_TOKEN.findall(text))
+    return [pattern for pattern in patterns if pattern[0]]
+
+def _url_match(pattern: tuple[str, str], current: tuple[str, str]) -> Optional[int]:
+    """
+    Length of the pattern's path if it covers the current URL, else None: the host
+    must be equal or a parent domain, and the path a prefix on a segment boundary.
+    """
+    host, path = pattern
+    current_host, current_path = current
+    if current_host != host and not current_host.endswith("." + host):
+        return None
+    if path and current_path != path and not current_path.startswith(path + "/"):
+        return None
+    return len(path)
+
+def _quoted_phrases(text: str) -> list[str]:
+    return [phrase.lower() for phrase in _QUOTED_PHRASE.findall(text)]
 
 class StateSynthesis():
-    def __init__(self, llm: BaseChatModel, controller: BaseController):
+    def __init__(self, llm: BaseChatModel, controller: BaseController, config: Optional[dict] = None):
+        default_config = {
+            "speculative_synthesis": True,
+            "local_state_selection": True,
+            "max_trigger_candidates": 60,
+            "trigger_candidate_token_budget": 2000,
+        }
+        self.config = {**default_config, **(config or {})}
         self.llm = llm
         self.controller = controller
         self.trigger_registry = TriggerRegistry(controller)
         self.workflow = self._initalize_workflow()
         self.graph = self.workflow.compile()
 
+        # Page trigger discovery runs here while the state is being selected, next
+        # to the speculative LLM calls (plain invoke calls, so no event loop is
+        # created per selection for async clients to get bound to)
+        self._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="netgent-synthesis")
+        self._page_triggers: Optional[Future] = None
+
+        # How states were selected: "local" skipped the LLM, "llm" asked it;
+        # "reasons" counts each decision by the local selector's reason
+        self.selection_metrics = {"local": 0, "llm": 0, "reasons": {}}
+
 
     def run(self, prompts: list[StatePrompt], executed: list[dict[str, Any]]):
-        state = StateSynthesisState(prompts=prompts, choice=None, executed=executed, triggers=[])
+        state = StateSynthesisState(prompts=prompts, choice=None, executed=executed, triggers=[], speculated=None)
         state = self.graph.invoke(state, { "recursion_limit": 100})
         return state
     
@@ -39,12 +96,12 @@ class StateSynthesis():
             prompt.append(f"Step {i+1} - {execute['name']}: {execute['description']}")
         return "\n".join(prompt)
     
-    def _select_state(self, state: StateSynthesisState):
+    def _select_state_messages(self, state: StateSynthesisState, url: str, title: str):
         # Define the Messages for the LLM
         """
         Include the History of Action, Current Website State, and the Available States
         """
-        messages = [
+        return [
             SystemMessage(content=get_prompt("CHOOSE_STATE_PROMPT").format(
                 STATES='\n'.join(str(prompt) for prompt in state['prompts']) + '\n'
             )),
@@ -55,71 +112,175 @@ class StateSynthesis():
     ## History of Action
     {self._prompt_execution(state.get('executed', [])) if state.get('executed') else 'No History of Actions'}
     ## Current Website State
-    URL: {self.controller.driver.current_url}
-    Title: {self.controller.driver.title}
+    URL: {url}
+    Title: {title}
     """
                 }
             ])
         ]
-        
-        # Selecting the State to Run
-        response = self.llm.invoke(messages)
-        
+
+    def _parse_choice(self, state: StateSynthesisState, content: str) -> Optional[StatePrompt]:
         # Finding the State Prompt
         # Use Regex to Find "State:"
-        state_match = re.search(r'State:\s*(.+)', response.content, re.IGNORECASE)
+        state_match = re.search(r'State:\s*(.+)', content, re.IGNORECASE)
         state_name = state_match.group(1).strip() if state_match else None
         
         # Fallback: Find First Matching State Name in Response Content
         if not state_name:
             for prompt in state["prompts"]:
-                if prompt.name in response.content:
+                if prompt.name in content:
                     state_name = prompt.name
                     break
         
         # Selected Prompt
-        choice = next(
+        return next(
             (prompt for prompt in state["prompts"] if prompt.name == state_name),
             None
         )
 
+    def _local_select(self, state: StateSynthesisState, url: str, title: str) -> tuple[Optional[StatePrompt], bool, str]:
+        """
+        Picks a state without the LLM when the page and history already decide it.
+
+        Returns:
+            (prompt, confident, reason). A confident choice is used as is; any
+            other prompt is only a guess to speculate on while the LLM decides.
+        """
+        prompts = state["prompts"]
+        if len(prompts) == 1:
+            return prompts[0], True, "only_prompt"
+
+        executed_names = {executed.get("name") for executed in state.get("executed") or []}
+        remaining = [prompt for prompt in prompts if prompt.name not in executed_names]
+        candidates = remaining or prompts
+
+        current_url = _split_url(url)
+        current_title = (title or "").lower()
+        path_matches, host_matches, title_matches = [], [], []
+        for prompt in candidates:
+            trigger_text = " ".join(prompt.triggers)
+            lengths = [length for length in (_url_match(pattern, current_url) for pattern in _url_patterns(trigger_text)) if length is not None]
+            # A bare domain matches every page of the site, so only a path decides
+            if any(lengths):
+                path_matches.append((max(lengths), prompt))
+            elif lengths:
+                host_matches.append(prompt)
+            elif current_title and any(phrase in current_title for phrase in _quoted_phrases(trigger_text)):
+                title_matches.append(prompt)
+
+        # History leaves a single state, but the page may fit none; only a
+        # URL or title signal for it makes the choice confident
+        if len(remaining) == 1:
+            signalled = [prompt for _, prompt in path_matches] + host_matches + title_matches
+            return remaining[0], any(prompt is remaining[0] for prompt in signalled), "only_remaining_prompt"
+
+        if path_matches:
+            longest = max(length for length, _ in path_matches)
+            best = [prompt for length, prompt in path_matches if length == longest]
+            if len(best) == 1:
+                return best[0], True, "url_match"
+            return None, False, "ambiguous"
+        if len(host_matches) == 1:
+            return host_matches[0], False, "host_match"
+        if not host_matches and len(title_matches) == 1:
+            return title_matches[0], False, "title_match"
+        return None, False, "ambiguous"
+
+    def _record_selection(self, decision: str, reason: str) -> None:
+        metrics = self.selection_metrics
+        metrics[decision] = metrics.get(decision, 0) + 1
+        metrics["reasons"][f"{decision}:{reason}"] = metrics["reasons"].get(f"{decision}:{reason}", 0) + 1
+
+    def _select_state(self, state: StateSynthesisState):
+        url, title = self.controller.driver.current_url, self.controller.driver.title
+        self._page_triggers = self._executor.submit(find_trigger, self.controller.driver)
+
+        guess, confident, reason = (None, False, "disabled")
+        if self.config["local_state_selection"]:
+            guess, confident, reason = self._local_select(state, url, title)
+
+        if guess is not None and self.config["speculative_synthesis"]:
+            return self._speculate(state, guess, url, title, confirm=not confident, reason=reason)
+
+        if confident:
+            self._record_selection("local", reason)
+            print(f"CHOICE ({reason}): ", guess)
+            return { **state, "choice": guess }
+
+        # Selecting the State to Run
+        response = self.llm.invoke(self._select_state_messages(state, url, title))
+        choice = self._parse_choice(state, response.content)
+        self._record_selection("llm", reason)
+
         print("CHOICE: ", choice)
 
         # Return the Selected Prompt
         return { **state, "choice": choice }
-    
-    def _define_trigger(self, state: StateSynthesisState):
-        # Define the Trigger for the State
-        # Get available triggers from the page
-        page_triggers = find_trigger(self.controller.driver)
-        
-        # Get all available trigger types from the registry
-        available_trigger_types = list(self.trigger_registry.get_all_triggers().keys())
-        print("AVAILABLE_TRIGGER_TYPES: ", available_trigger_types)
-        
+
+    def _speculate(self, state: StateSynthesisState, guess: StatePrompt, url: str, title: str, confirm: bool = True, reason: str = ""):
+        """
+        Generates the guessed state's triggers and action prompt concurrently.
+
+        With `confirm`, the state is selected by the LLM at the same time, so all
+        three LLM calls run concurrently. If the LLM picks another state, the
+        speculative results are dropped and the next nodes generate them for the
+        actual choice.
+        """
+        page_triggers = self._page_triggers
+
+        def define_trigger():
+            # find_trigger was submitted first, so it already has a worker
+            triggers_dict, messages = self._define_trigger_messages(guess, page_triggers.result(), url)
+            response = self.llm.with_structured_output(LLMTriggerOutput).invoke(messages)
+            return [triggers_dict[key] for key in response.triggers if key in triggers_dict]
+
+        triggers_future = self._executor.submit(define_trigger)
+        prompt_future = self._executor.submit(self.llm.invoke, self._prompt_action_messages(state, guess, url, title))
+        selection = self.llm.invoke(self._select_state_messages(state, url, title)) if confirm else None
+        triggers, prompt = triggers_future.result(), prompt_future.result()
+        if confirm:
+            choice = self._parse_choice(state, selection.content)
+            self._record_selection("llm", reason)
+            print("CHOICE: ", choice)
+        else:
+            choice = guess
+            self._record_selection("local", reason)
+            print(f"CHOICE ({reason}): ", choice)
+        if choice is not guess:
+            return { **state, "choice": choice }
+
+        print("TRIGGERS: ", triggers)
+        self._page_triggers = None
+        return { **state, "choice": choice, "triggers": triggers, "prompt": prompt.content, "speculated": choice.name }
+
+    def _viewport_height(self) -> Optional[float]:
+        """innerHeight of the page, or None if it cannot be read."""
+        try:
+            return self.controller.get_viewport_geometry()["innerHeight"]
+        except Exception as e:
+            print(f"Could not read the viewport height: {e}")
+            return None
+
+    def _trigger_candidates(self, page_triggers: list[dict[str, Any]], url: str, choice: StatePrompt) -> dict[str, dict]:
         #--- TODO: Current Hardcoded Triggers But Should be Dynamic (We Will Be Changed in the Future) ---#
         triggers_dict = {}
         # Add URL as Trigger 0
         triggers_dict["URL"] = {
             "type": "url",
-            "params": {"url": self.controller.driver.current_url}
+            "params": {"url": url}
         }
-        # Process other Triggers Starting from Index 1
-        for i, trigger in enumerate(page_triggers):
-            if trigger.get("text", "") != "":
-                triggers_dict[f"TEXT_{i}"] = {
-                    "type": "text",
-                    "params": {"text": trigger.get("text", "")}
-                }
-            if trigger.get("enhancedCssSelector", "") != "":
-                triggers_dict[f"CSS_{i}"] = {
-                    "type": "element",
-                    "params": {
-                        "by": "css selector",
-                        "selector": trigger.get("enhancedCssSelector", "")
-                    }
-                }
-        #--- Current Hardcoded Triggers But Should be Dynamic (We Will Be Changed in the Future) ---#
+        # Page elements, ranked against the state's trigger descriptions and truncated
+        triggers_dict.update(rank_trigger_candidates(
+            page_triggers,
+            choice.triggers,
+            viewport_height=self._viewport_height(),
+            max_candidates=self.config["max_trigger_candidates"],
+            token_budget=self.config["trigger_candidate_token_budget"],
+        ))
+        return triggers_dict
+
+    def _define_trigger_messages(self, choice: StatePrompt, page_triggers: list[dict[str, Any]], url: str):
+        triggers_dict = self._trigger_candidates(page_triggers, url, choice)
 
         # Format Triggers for Prompt
         formatted_triggers = []
@@ -138,40 +299,62 @@ class StateSynthesis():
                 {
                     "type": "text", 
                     "text": f"""## State Triggers
-    {chr(10).join(f"- {trigger}" for trigger in state['choice'].triggers)}
+    {chr(10).join(f"- {trigger}" for trigger in choice.triggers)}
                     """
                 },
             ])
         ]
+        return triggers_dict, messages
+
+    def _define_trigger(self, state: StateSynthesisState):
+        if state.get("speculated") is not None:
+            return state
+
+        # Define the Trigger for the State
+        # Get available triggers from the page, usually already found during state selection
+        if self._page_triggers is not None:
+            page_triggers = self._page_triggers.result()
+            self._page_triggers = None
+        else:
+            page_triggers = find_trigger(self.controller.driver)
+        
+        # Get all available trigger types from the registry
+        available_trigger_types = list(self.trigger_registry.get_all_triggers().keys())
+        print("AVAILABLE_TRIGGER_TYPES: ", available_trigger_types)
+
+        triggers_dict, messages = self._define_trigger_messages(state['choice'], page_triggers, self.controller.driver.current_url)
 
         # Return the Triggers
-        class LLMTriggerOutput(BaseModel):
-            triggers: List[str]
         response = self.llm.with_structured_output(LLMTriggerOutput).invoke(messages)
         triggers = [triggers_dict[key] for key in response.triggers if key in triggers_dict]
 
         print("TRIGGERS: ", triggers)
 
         return { **state, "triggers": triggers }
-    
-    def _prompt_action(self, state: StateSynthesisState):
-        messages = [
+
+    def _prompt_action_messages(self, state: StateSynthesisState, choice: StatePrompt, url: str, title: str):
+        return [
             SystemMessage(content=get_prompt("PROMPT_ACTION_PROMPT")),
             HumanMessage(content=[
                 {
                     "type": "text", 
                     "text": f"""## User Instruction
-    {chr(10).join(f"{i+1}. {action}" for i, action in enumerate(state['choice'].actions)) + chr(10) + "TERMINATE ACTION"}
+    {chr(10).join(f"{i+1}. {action}" for i, action in enumerate(choice.actions)) + chr(10) + "TERMINATE ACTION"}
     ## History of Action
     {self._prompt_execution(state.get('executed', [])) if state.get('executed') else 'No History of Actions'}
     ## Current Website State
-    URL: {self.controller.driver.current_url}
-    Title: {self.controller.driver.title}
+    URL: {url}
+    Title: {title}
     """
                 },
             ])
         ]
+    
+    def _prompt_action(self, state: StateSynthesisState):
+        if state.get("speculated") is not None:
+            return state
 
+        messages = self._prompt_action_messages(state, state['choice'], self.controller.driver.current_url, self.controller.driver.title)
         response = self.llm.invoke(messages)        
         return { **state, "prompt": response.content }
     
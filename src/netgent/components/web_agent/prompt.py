@@ -0,0 +1,52 @@
+import os
+from functools import lru_cache
+
+PROMPTS_DIR = os.path.join(os.path.dirname(__file__), "prompts")
+
+# name -> (modification time, text), filled once per process
+_cache: dict[str, tuple[float, str]] = {}
+
+
+def _read_markdown(name: str) -> tuple[float, str]:
+    file_path = os.path.join(PROMPTS_DIR, f"{name}.md")
+    mtime = os.stat(file_path).st_mtime
+    with open(file_path, "r") as f:
+        return mtime, f.read()
+
+
+def get_prompt(name: str, reload: bool = False) -> str:
+    """
+    Returns the prompt template `name` from the prompts directory.
+
+    Templates are read from disk once per process. With `reload`, the file's
+    modification time is checked on every call and a changed file is read
+    again, which is meant for prompt development.
+    """
+    cached = _cache.get(name)
+    if cached is None:
+        cached = _cache[name] = _read_markdown(name)
+    elif reload and os.stat(os.path.join(PROMPTS_DIR, f"{name}.md")).st_mtime != cached[0]:
+        cached = _cache[name] = _read_markdown(name)
+    return cached[1]
+
+
+def compose_prompt(names: tuple[str, ...], formatted: tuple[str, ...] = (), reload: bool = False) -> str:
+    """
+    Joins prompt templates with blank lines.
+
+    The templates named in `formatted` keep their `{field}` placeholders and
+    every other template has its braces escaped, so the result needs a single
+    `.format` call. Without `formatted`, the result is plain text.
+    The composition is memoized on the templates' contents.
+    """
+    return _compose(names, formatted, tuple(get_prompt(name, reload) for name in names))
+
+
+@lru_cache(maxsize=32)
+def _compose(names: tuple[str, ...], formatted: tuple[str, ...], texts: tuple[str, ...]) -> str:
+    if not formatted:
+        return "\n\n".join(texts)
+    return "\n\n".join(
+        text if name in formatted else text.replace("{", "{{").replace("}", "}}")
+        for name, text in zip(names, texts)
+    )
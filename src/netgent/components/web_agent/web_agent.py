@@ -8,10 +8,11 @@ from pydantic import BaseModel, Field
 from dotenv import load_dotenv
 from ...browser.controller.base import BaseController
 from ...browser.registry import ActionRegistry
-from ...browser.utils import mark_page
-from netgent.utils.message import Message, format_context, Metadata, ActionOutput
+from ...browser.utils import mark_page, DomSnapshot, ScreenshotPipeline, ElementPrompt
+from .prompt import compose_prompt
+from netgent.utils.message import Message, ContextBuilder, Metadata, ActionOutput, spill_screenshots
+from netgent.utils.blob_store import BlobStore
 import time
-import os
 load_dotenv()
 
 
@@ -24,7 +25,22 @@ class WebAgentState(TypedDict):
 
 
 class WebAgent():
-    def __init__(self, llm: BaseChatModel, controller: BaseController):
+    def __init__(self, llm: BaseChatModel, controller: BaseController, config: Optional[dict] = None):
+        default_config = {
+            "incremental_snapshots": False,
+            "screenshot_format": "png",
+            "screenshot_quality": None,
+            "screenshot_clip": None,
+            "screenshot_token_budget": None,
+            "screenshot_reuse_threshold": None,
+            "screenshot_perceptual_hash": False,
+            "reload_prompts": False,
+            "context_window": None,
+            "screenshots_in_memory": 3,
+            "blob_store_dir": None,
+            "element_token_budget": None,
+        }
+        self.config = {**default_config, **(config or {})}
         self.llm = llm
         self.controller = controller
         self.driver = controller.driver
@@ -37,16 +53,28 @@ class WebAgent():
         self.elements = None
         self.prompt = None
         self.screenshot = None
+        # Only transfers the DOM nodes changed since the previous annotation
+        self.dom_snapshot = DomSnapshot() if self.config["incremental_snapshots"] else None
+        self.element_prompt = None
+        if self.config["element_token_budget"] is not None:
+            self.element_prompt = ElementPrompt(self.config["element_token_budget"])
+        self.context = ContextBuilder(window=self.config["context_window"])
+        self.blob_store = BlobStore(self.config["blob_store_dir"])
+        self.screenshots = ScreenshotPipeline(self.driver, {
+            "format": self.config["screenshot_format"],
+            "quality": self.config["screenshot_quality"],
+            "clip": self.config["screenshot_clip"],
+            "token_budget": self.config["screenshot_token_budget"],
+            "reuse_threshold": self.config["screenshot_reuse_threshold"],
+            "perceptual_hash": self.config["screenshot_perceptual_hash"],
+        })
         
         ## JSON Output Parser ##
         self.action_parser = JsonOutputParser(pydantic_object=ActionOutput)
         
 
-    def _get_prompt(self, name: str) -> str:
-        prompts_dir = os.path.join(os.path.dirname(__file__), 'prompts')
-        prompt_file = os.path.join(prompts_dir, f"{name}.md")
-        with open(prompt_file, 'r') as f:
-            return f.read()
+    def _compose_prompt(self, *names: str, formatted: tuple[str, ...] = ()) -> str:
+        return compose_prompt(names, formatted, reload=self.config["reload_prompts"])
     
     def _convert_action_to_json(self, action_output: dict) -> dict:
         action_name = action_output.get("action")
@@ -108,7 +136,7 @@ class WebAgent():
     
     def _annotate(self, state: WebAgentState):
         time.sleep(2 * self.wait_period)
-        self.elements, self.prompt, self.screenshot = mark_page(self.driver).with_retry().invoke(None)
+        self.elements, self.prompt, self.screenshot = mark_page(self.driver, self.dom_snapshot, self.screenshots, self.element_prompt).with_retry().invoke(None)
         state["messages"] += [Metadata(
             timestamp=state["timestep"], 
             elements=self.elements, 
@@ -118,33 +146,34 @@ class WebAgent():
             url=self.driver.current_url, 
             title=self.driver.title
         )]
+        # Only the latest screenshots are sent to the LLM; older ones go to disk
+        spill_screenshots(state["messages"], self.blob_store, keep=self.config["screenshots_in_memory"])
         state["timestep"] += 1
         return { **state }
     
 
     def _plan(self, state: WebAgentState):
-        prompt = self._get_prompt("PLAN_PROMPT")
+        prompt_name = "PLAN_PROMPT"
         if state["global_plan"] != "":
-            prompt = self._get_prompt("REPLAN_PROMPT")
+            prompt_name = "REPLAN_PROMPT"
 
         response = self.llm.invoke(input=[
-            SystemMessage(content=self._get_prompt("ACTION_SHORT_PROMPT") + "\n\n" + prompt),
+            SystemMessage(content=self._compose_prompt("ACTION_SHORT_PROMPT", prompt_name)),
             HumanMessage(content=[
                 {
                     "type": "text", 
                     "text": f"""## User Query: {state['user_query']}
-                    ## Initial HTML State: {self.prompt}
                     You MUST start with the '## Step 1' header and follow the format provided in the examples."""
                 },
                 {
                     "type": "text",
-                    "text": f"""## Previous Action Trajectory:\n{format_context(state['messages'])}\n## Current HTML: {self.prompt}"""
+                    "text": f"""## Previous Action Trajectory:\n{self.context.build(state['messages'])}\n## Current HTML: {self.prompt}"""
                 },
                 {
                     "type": "image",
                     "source_type": "base64",
                     "data": self.screenshot,
-                    "mime_type": "image/png"
+                    "mime_type": self.screenshots.mime_type
                 }
             ])
         ])
@@ -153,18 +182,16 @@ class WebAgent():
     
     def _execute(self, state: WebAgentState):
         # Create the system message with action instructions
-        system_content = (
-            self._get_prompt("RULES_PROMPT") + "\n\n" +
-            self._get_prompt("EXECUTE_PROMPT").format(
-                intent=state['user_query'], 
-                global_plan=state['global_plan']
-            ) + "\n\n" +
-            self._get_prompt("ACTION_PROMPT")
+        system_content = self._compose_prompt(
+            "RULES_PROMPT", "EXECUTE_PROMPT", "ACTION_PROMPT", formatted=("EXECUTE_PROMPT",)
+        ).format(
+            intent=state['user_query'], 
+            global_plan=state['global_plan']
         )
 
         prompt = ChatPromptTemplate.from_messages([
             SystemMessage(content=system_content),
-            HumanMessage(content=f"## Previous Action Trajectory:\n{format_context(state['messages'])}\n## Current HTML: {self.prompt}"),
+            HumanMessage(content=f"## Previous Action Trajectory:\n{self.context.build(state['messages'])}\n## Current HTML: {self.prompt}"),
             HumanMessage(content=[
                 {
                     "type": "text",
@@ -174,7 +201,7 @@ class WebAgent():
                     "type": "image",
                     "source_type": "base64",
                     "data": self.screenshot,
-                    "mime_type": "image/png"
+                    "mime_type": self.screenshots.mime_type
                 }
             ])
         ])
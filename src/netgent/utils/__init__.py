@@ -15,9 +15,12 @@ Main Classes:
     ActionOutput: Structured output from LLM for action generation
     StatePrompt: High-level state definition for workflows
     Metadata: Captures page state at a specific point in time
+    DiskLLMCache: On-disk LLM response cache
     
 Main Functions:
     format_context: Format message history for LLM consumption
+    ContextBuilder: Incrementally format a growing message history
+    spill_screenshots: Move old screenshots into a BlobStore
     save_context_to_file: Save message context to JSON
     load_context_from_file: Load message context from JSON
 """
@@ -34,9 +37,13 @@ from .message import (
     StatePrompt,
     format_context,
     format_context_without_reflection,
+    ContextBuilder,
+    spill_screenshots,
     save_context_to_file,
     load_context_from_file,
 )
+from .blob_store import BlobStore
+from .llm_cache import DiskLLMCache
 
 __all__ = [
     "Message",
@@ -50,6 +57,10 @@ __all__ = [
     "StatePrompt",
     "format_context",
     "format_context_without_reflection",
+    "ContextBuilder",
+    "spill_screenshots",
+    "BlobStore",
+    "DiskLLMCache",
     "save_context_to_file",
     "load_context_from_file",
 ]
@@ -0,0 +1,68 @@
+import os
+import atexit
+import shutil
+import base64
+import hashlib
+import tempfile
+from typing import Optional
+
+# Prefix of the strings that stand in for a blob in a message
+BLOB_REFERENCE_PREFIX = "blob:sha256:"
+
+
+class BlobStore:
+    """
+    Content-addressed on-disk store for base64 payloads such as screenshots.
+
+    Each payload is decoded and written once under its SHA-256 digest, so a
+    repeated screenshot costs no extra disk space. Messages keep the returned
+    reference string in place of the payload.
+
+    Without a root, blobs go to a private temporary directory that is removed
+    when the process exits, so references do not outlive the run. Pass a root
+    to keep them, e.g. for contexts saved with save_context_to_file.
+    """
+
+    def __init__(self, root: Optional[str] = None):
+        self.temporary = root is None
+        if self.temporary:
+            self.root = tempfile.mkdtemp(prefix="netgent-blobs-")
+            atexit.register(self.cleanup)
+        else:
+            self.root = root
+            os.makedirs(self.root, exist_ok=True)
+
+    def cleanup(self) -> None:
+        """Removes a temporary store from disk. Stores with an explicit root are kept."""
+        if self.temporary:
+            shutil.rmtree(self.root, ignore_errors=True)
+
+    @staticmethod
+    def is_reference(value) -> bool:
+        return isinstance(value, str) and value.startswith(BLOB_REFERENCE_PREFIX)
+
+    def _path(self, digest: str) -> str:
+        return os.path.join(self.root, digest[:2], digest)
+
+    def put(self, data: str) -> str:
+        """Stores base64 data and returns its reference. References are returned unchanged."""
+        if self.is_reference(data):
+            return data
+        raw = base64.b64decode(data)
+        digest = hashlib.sha256(raw).hexdigest()
+        path = self._path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Write to a temporary file first so readers never see a partial blob
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+            with os.fdopen(fd, "wb") as f:
+                f.write(raw)
+            os.replace(tmp_path, path)
+        return BLOB_REFERENCE_PREFIX + digest
+
+    def get(self, reference: str) -> str:
+        """Returns the base64 data of a reference. Other values are returned unchanged."""
+        if not self.is_reference(reference):
+            return reference
+        with open(self._path(reference[len(BLOB_REFERENCE_PREFIX):]), "rb") as f:
+            return base64.b64encode(f.read()).decode("ascii")
@@ -0,0 +1,113 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from typing import Any, Callable, Optional, Sequence
+from langchain_core.caches import BaseCache
+from langchain_core.load import dumps, loads
+from langchain_core.outputs import Generation
+
+DEFAULT_MAX_ENTRIES = 10000
+
+
+class DiskLLMCache(BaseCache):
+    """
+    On-disk LLM response cache with TTL and LRU eviction.
+
+    Plugs into any LangChain chat model through its `cache` attribute, so
+    plain invoke calls, with_structured_output and chains are all covered.
+    Entries are keyed by a SHA-256 of the canonicalized messages and the
+    model parameters (model name, temperature, bound tools, ...).
+
+    Inline base64 images are keyed by their digest, or by `image_key(data)`
+    when it returns a value; passing ScreenshotPipeline.image_key keys
+    screenshots by their perceptual hash, so near-identical frames hit.
+
+    Args:
+        path: Directory holding the cache database
+        ttl: Seconds after which an entry expires; None keeps entries forever
+        max_entries: Least recently used entries beyond this are evicted
+        image_key: Optional function mapping base64 image data to a cache key
+    """
+
+    def __init__(self, path: str, ttl: Optional[float] = None, max_entries: int = DEFAULT_MAX_ENTRIES, image_key: Optional[Callable[[str], Optional[str]]] = None):
+        os.makedirs(path, exist_ok=True)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.image_key = image_key
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(os.path.join(path, "llm_cache.sqlite3"), check_same_thread=False)
+        with self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY, value TEXT NOT NULL, created REAL NOT NULL, accessed REAL NOT NULL)"
+            )
+            self._connection.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)")
+
+    def key(self, prompt: str, llm_string: str) -> str:
+        """Canonical hash of a serialized prompt and the model parameters."""
+        try:
+            canonical = json.dumps(self._canonicalize(json.loads(prompt)), sort_keys=True, separators=(",", ":"))
+        except ValueError:
+            canonical = prompt
+        return hashlib.sha256(f"{canonical}\0{llm_string}".encode("utf-8")).hexdigest()
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[Sequence[Generation]]:
+        key = self.key(prompt, llm_string)
+        now = time.time()
+        with self._lock, self._connection:
+            row = self._connection.execute("SELECT value, created FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            value, created = row
+            if self.ttl is not None and now - created > self.ttl:
+                self._connection.execute("DELETE FROM entries WHERE key = ?", (key,))
+                return None
+            self._connection.execute("UPDATE entries SET accessed = ? WHERE key = ?", (now, key))
+        return [loads(generation) for generation in json.loads(value)]
+
+    def update(self, prompt: str, llm_string: str, return_val: Sequence[Generation]) -> None:
+        key = self.key(prompt, llm_string)
+        value = json.dumps([dumps(generation) for generation in return_val])
+        now = time.time()
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO entries (key, value, created, accessed) VALUES (?, ?, ?, ?)",
+                (key, value, now, now),
+            )
+            self._evict(now)
+
+    def clear(self, **kwargs: Any) -> None:
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM entries")
+
+    def _evict(self, now: float) -> None:
+        if self.ttl is not None:
+            self._connection.execute("DELETE FROM entries WHERE created < ?", (now - self.ttl,))
+        count = self._connection.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        if count > self.max_entries:
+            self._connection.execute(
+                "DELETE FROM entries WHERE key IN (SELECT key FROM entries ORDER BY accessed ASC LIMIT ?)",
+                (count - self.max_entries,),
+            )
+
+    def _canonicalize(self, value: Any) -> Any:
+        """Replaces inline base64 images with short, optionally perceptual, keys."""
+        if isinstance(value, dict):
+            if value.get("source_type") == "base64" and isinstance(value.get("data"), str):
+                return {**{k: self._canonicalize(v) for k, v in value.items() if k != "data"}, "data": self._image_key(value["data"])}
+            return {k: self._canonicalize(v) for k, v in value.items()}
+        if isinstance(value, list):
+            return [self._canonicalize(item) for item in value]
+        if isinstance(value, str) and value.startswith("data:image/") and ";base64," in value:
+            header, data = value.split(",", 1)
+            return f"{header},{self._image_key(data)}"
+        return value
+
+    def _image_key(self, data: str) -> str:
+        if self.image_key is not None:
+            key = self.image_key(data)
+            if key is not None:
+                return key
+        return "sha256:" + hashlib.sha256(data.encode("utf-8")).hexdigest()
@@ -1,6 +1,7 @@
 from pydantic import BaseModel, Field
 from typing import Optional
 import json
+from .blob_store import BlobStore
 
 class Message(BaseModel):
     pass
@@ -111,30 +112,107 @@ CHECKS:
     
     
 
+def _render_message(message: Message, include_reflection: bool = True) -> str:
+    """The fragment a message contributes to the formatted context."""
+    if isinstance(message, Metadata):
+        return "\n" + str(message) + "\n"
+    if not include_reflection and isinstance(message, Reflection):
+        return ""
+    return str(message) + "\n"
+
 def format_context(context: list[Message]):
-    overall_str = ""
-    for message in context:
-        if isinstance(message, Metadata):
-            overall_str += "\n" + str(message) + "\n"
-        else:
-            overall_str += str(message) + "\n"
-    return overall_str
+    return "".join([_render_message(message) for message in context])
 
 def format_context_without_reflection(context: list[Message]):
-    overall_str = ""
-    for message in context:
-        if isinstance(message, Metadata):
-            overall_str += "\n" + str(message) + "\n"
-        elif not isinstance(message, Reflection):
-            overall_str += str(message) + "\n"
-    return overall_str
-
-
-def save_context_to_file(context: list[Message], filename: str = "context_output.json"):
-    """Save context messages to a JSON file."""
+    return "".join([_render_message(message, include_reflection=False) for message in context])
+
+
+class ContextBuilder:
+    """
+    Incrementally formatted message history.
+
+    Message lists only grow during a run, so each message is rendered once and
+    build() only renders the messages appended since the previous call. The
+    joined string is cached until a message is added. If the list is replaced
+    or rewritten, it is rendered again from scratch.
+
+    Args:
+        include_reflection: Include Reflection messages, as format_context does
+        window: If set, only the last `window` timesteps (each starting at a
+            Metadata message) are kept in the output
+    """
+
+    def __init__(self, include_reflection: bool = True, window: Optional[int] = None):
+        self.include_reflection = include_reflection
+        self.window = window
+        self.reset()
+
+    def reset(self) -> None:
+        self.fragments = []
+        self.step_starts = []
+        self._first = None
+        self._last = None
+        self._text = ""
+
+    def build(self, context: list[Message]) -> str:
+        """The formatted context, equal to format_context(context) without a window."""
+        rendered = len(self.fragments)
+        if rendered > len(context) or (rendered and (context[0] is not self._first or context[rendered - 1] is not self._last)):
+            self.reset()
+            rendered = 0
+        if rendered == len(context):
+            return self._text
+
+        new_fragments = []
+        for message in context[rendered:]:
+            if isinstance(message, Metadata):
+                self.step_starts.append(len(self.fragments) + len(new_fragments))
+            new_fragments.append(_render_message(message, self.include_reflection))
+        self.fragments.extend(new_fragments)
+        self._first, self._last = context[0], context[-1]
+
+        if self.window is None or len(self.step_starts) <= self.window:
+            self._text += "".join(new_fragments)
+        else:
+            omitted = len(self.step_starts) - self.window
+            self._text = f"[{omitted} earlier timesteps omitted]\n" + "".join(self.fragments[self.step_starts[omitted]:])
+        return self._text
+
+
+def spill_screenshots(context: list[Message], store: BlobStore, keep: int = 0) -> None:
+    """
+    Moves all but the last `keep` Metadata screenshots into the blob store,
+    replacing them with references.
+
+    Older screenshots are already spilled by earlier calls, so only the most
+    recent messages are visited.
+    """
+    inline = 0
+    for message in reversed(context):
+        if not isinstance(message, Metadata) or not message.screenshot:
+            continue
+        if store.is_reference(message.screenshot):
+            if inline >= keep:
+                break
+            continue
+        inline += 1
+        if inline > keep:
+            message.screenshot = store.put(message.screenshot)
+
+
+def save_context_to_file(context: list[Message], filename: str = "context_output.json", store: Optional[BlobStore] = None):
+    """
+    Save context messages to a JSON file.
+
+    With a store, screenshots are written as blob references instead of
+    inline base64; the messages themselves are left unchanged.
+    """
     context_data = []
     for message in context:
-        context_data.append(message.model_dump())
+        data = message.model_dump()
+        if store is not None and isinstance(message, Metadata) and message.screenshot:
+            data["screenshot"] = store.put(message.screenshot)
+        context_data.append(data)
     
     with open(filename, "w") as f:
         json.dump(context_data, f, indent=2)